@@ -6,10 +6,11 @@ Timeline saved to timeline.png
 visualize.py: Plot a Gantt-style timeline of operations executed by machines M1, M2, M3
 
 Usage:
-    python visualize.py trace.xlsx -o timeline.png
+    python visualize.py results/trace.csv -o timeline.png
+    python visualize.py trace.xlsx -o timeline.png   (main.py --with_xlsx 로 저장한 경우)
 
 Requires:
-    pandas, matplotlib, openpyxl
+    pandas, matplotlib (openpyxl: .xlsx 입력일 때만)
 Install with:
     pip install pandas matplotlib openpyxl
 """
@@ -20,14 +21,18 @@ import argparse
 def main():
     parser = argparse.ArgumentParser(
         description='Visualize machine operations timeline.')
-    parser.add_argument('input', help='Path to trace Excel file')
+    parser.add_argument('input', nargs='?', default='results/trace.csv',
+                        help='Path to trace file (.csv or .xlsx, default: results/trace.csv)')
     parser.add_argument('-o', '--output',
                         help='Path to save output figure',
                         default='timeline.png')
     args = parser.parse_args()
 
-    # Load trace data
-    df = pd.read_excel(args.input)
+    # Load trace data (trace.xlsx는 --with_xlsx 실행 시에만 생성되므로 확장자로 구분)
+    if args.input.lower().endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(args.input)
+    else:
+        df = pd.read_csv(args.input)
 
     # Extract start and end times for each operation
     df_start = df[df['event'] == 'start'][['part', 'job', 'operation', 'machine', 'time']]
@@ -1,4 +1,4 @@
-# --- simulator/builder.py ---# --- simulator/builder.py ---
+# --- simulator/builder.py ---
 import os, json
 from simulator.domain.domain import Job, Operation
 from simulator.model.machine import Machine
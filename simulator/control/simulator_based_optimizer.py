@@ -4,7 +4,6 @@ import random
 from enum import Enum, auto
 from typing import List, Dict, Optional, Tuple
 from simulator.engine.simulator import Simulator, Action, SimulatorState
-import heapq
 
 class SearchAlgorithm(Enum):
     BRANCH_AND_BOUND = auto()
@@ -44,7 +43,7 @@ class OptimizationResult:
 class SimulatorBasedOptimizer:
     def __init__(self, simulator: Simulator, algorithm: SearchAlgorithm = SearchAlgorithm.BRANCH_AND_BOUND,
                  time_limit: float = 300.0, max_depth: int = 100, max_nodes: int = 10000,
-                 rollout_policy: Policy = Policy.ECT, seed: int = 42):
+                 rollout_policy: Policy = Policy.ECT, seed: int = 42, verbose: bool = False):
         self.simulator = simulator
         self.algorithm = algorithm
         self.time_limit = time_limit
@@ -52,6 +51,7 @@ class SimulatorBasedOptimizer:
         self.max_nodes = max_nodes
         self.rollout_policy = rollout_policy
         self.seed = seed
+        self.verbose = verbose  # 노드/액션 단위 탐색 로그 출력 여부
         
         # 검색 상태
         self.best_objective = float('inf')
@@ -101,11 +101,10 @@ class SimulatorBasedOptimizer:
             # 시뮬레이션을 한 단계 진행해보기
             print("시뮬레이션을 한 단계 진행해보겠습니다...")
             if self.simulator.event_queue:
-                evt = heapq.heappop(self.simulator.event_queue)
-                self.simulator.current_time = evt.time
-                m = self.simulator.models.get(evt.dest_model)
-                if m:
-                    m.handle_event(evt)
+                evt = self.simulator.pop_event()
+                handler = self.simulator.handlers.get(evt.dest_model)
+                if handler:
+                    handler(evt)
                 
                 # 다시 legal_actions 확인
                 legal_actions = self.simulator.legal_actions()
@@ -124,11 +123,10 @@ class SimulatorBasedOptimizer:
             # 시뮬레이션을 완료까지 실행하여 최종 결과 확인
             print("시뮬레이션을 완료까지 실행합니다...")
             while self.simulator.event_queue:
-                evt = heapq.heappop(self.simulator.event_queue)
-                self.simulator.current_time = evt.time
-                m = self.simulator.models.get(evt.dest_model)
-                if m:
-                    m.handle_event(evt)
+                evt = self.simulator.pop_event()
+                handler = self.simulator.handlers.get(evt.dest_model)
+                if handler:
+                    handler(evt)
             
             if self.simulator.is_terminal():
                 final_objective = self.simulator.objective()
@@ -151,44 +149,52 @@ class SimulatorBasedOptimizer:
             return
             
         self.nodes_explored += 1
-        print(f"  노드 탐색: 깊이 {node.depth}, 노드 수 {self.nodes_explored}")
+        if self.verbose:
+            print(f"  노드 탐색: 깊이 {node.depth}, 노드 수 {self.nodes_explored}")
         
         # 현재 상태로 복원
         self.simulator.restore(node.state)
         
         # 깊이 제한 확인 (무한 루프 방지)
         if node.depth >= 10:  # 최대 깊이를 10으로 증가
-            print(f"  깊이 제한 도달: {node.depth}")
+            if self.verbose:
+                print(f"  깊이 제한 도달: {node.depth}")
             return
         
         # 터미널 상태 확인
         if self.simulator.is_terminal():
             objective = self.simulator.objective()
-            print(f"  터미널 상태 도달: makespan = {objective}")
+            if self.verbose:
+                print(f"  터미널 상태 도달: makespan = {objective}")
             if objective < self.best_objective and objective != float('inf'):
                 self.best_objective = objective
                 self.best_schedule = self._extract_schedule(node)
                 self._log_decision("새로운 최적해 발견", objective, node.depth)
-                print(f"  새로운 최적해 발견: {objective}")
+                if self.verbose:
+                    print(f"  새로운 최적해 발견: {objective}")
             return
         
         # 가지치기: 하한이 현재 최적해보다 크면 탐색 중단
         lower_bound = self.simulator.lower_bound()
         if lower_bound >= self.best_objective:
             self._log_decision("가지치기", lower_bound, node.depth)
-            print(f"  가지치기: 하한 {lower_bound} >= 현재 최적해 {self.best_objective}")
+            if self.verbose:
+                print(f"  가지치기: 하한 {lower_bound} >= 현재 최적해 {self.best_objective}")
             return
         
         # 가능한 액션들 생성
         legal_actions = self.simulator.legal_actions()
-        print(f"  가능한 액션 수: {len(legal_actions)}")
+        if self.verbose:
+            print(f"  가능한 액션 수: {len(legal_actions)}")
         
         if not legal_actions:
             # 가능한 액션이 없으면 시뮬레이션을 한 단계 진행
-            print("  가능한 액션이 없음 - 시뮬레이션 진행")
+            if self.verbose:
+                print("  가능한 액션이 없음 - 시뮬레이션 진행")
             self._advance_simulation_one_step()
             legal_actions = self.simulator.legal_actions()
-            print(f"  진행 후 가능한 액션 수: {len(legal_actions)}")
+            if self.verbose:
+                print(f"  진행 후 가능한 액션 수: {len(legal_actions)}")
         
         # 액션 중복 제거
         unique_actions = []
@@ -199,7 +205,8 @@ class SimulatorBasedOptimizer:
                 unique_actions.append(action)
                 seen_actions.add(action_key)
         
-        print(f"  고유 액션 수: {len(unique_actions)}")
+        if self.verbose:
+            print(f"  고유 액션 수: {len(unique_actions)}")
         
         # Branch and Bound: 모든 가능한 액션을 평가하고 정렬
         action_evaluations = []
@@ -208,7 +215,8 @@ class SimulatorBasedOptimizer:
             if self._should_stop():
                 break
                 
-            print(f"  액션 평가: {action}")
+            if self.verbose:
+                print(f"  액션 평가: {action}")
             
             # 액션 적용
             changes = self.simulator.apply(action)
@@ -219,7 +227,8 @@ class SimulatorBasedOptimizer:
             # 하한 계산
             lower_bound = self.simulator.lower_bound()
             
-            print(f"    목적함수: {objective}, 하한: {lower_bound}")
+            if self.verbose:
+                print(f"    목적함수: {objective}, 하한: {lower_bound}")
             
             action_evaluations.append({
                 'action': action,
@@ -247,16 +256,19 @@ class SimulatorBasedOptimizer:
             # 가지치기: 하한이 현재 최적해보다 크면 탐색 중단
             if lower_bound >= self.best_objective:
                 self._log_decision("하한 가지치기", lower_bound, node.depth)
-                print(f"  하한 가지치기: {lower_bound} >= {self.best_objective}")
+                if self.verbose:
+                    print(f"  하한 가지치기: {lower_bound} >= {self.best_objective}")
                 continue
             
             # 가지치기: 목적함수가 현재 최적해보다 크면 탐색 중단
             if objective >= self.best_objective:
                 self._log_decision("목적함수 가지치기", objective, node.depth)
-                print(f"  목적함수 가지치기: {objective} >= {self.best_objective}")
+                if self.verbose:
+                    print(f"  목적함수 가지치기: {objective} >= {self.best_objective}")
                 continue
             
-            print(f"  액션 선택: {action} (목적함수: {objective})")
+            if self.verbose:
+                print(f"  액션 선택: {action} (목적함수: {objective})")
             
             # 액션 적용
             self.simulator.apply(action)
@@ -307,11 +319,10 @@ class SimulatorBasedOptimizer:
     def _advance_simulation_one_step(self):
         """시뮬레이션을 한 단계 진행합니다."""
         if self.simulator.event_queue:
-            evt = heapq.heappop(self.simulator.event_queue)
-            self.simulator.current_time = evt.time
-            m = self.simulator.models.get(evt.dest_model)
-            if m:
-                m.handle_event(evt)
+            evt = self.simulator.pop_event()
+            handler = self.simulator.handlers.get(evt.dest_model)
+            if handler:
+                handler(evt)
     
     def _complete_simulation(self) -> float:
         """현재 상태에서 시뮬레이션을 완료까지 실행하여 목적함수를 계산합니다."""
@@ -320,11 +331,10 @@ class SimulatorBasedOptimizer:
         
         # 시뮬레이션을 완료까지 실행
         while self.simulator.event_queue:
-            evt = heapq.heappop(self.simulator.event_queue)
-            self.simulator.current_time = evt.time
-            m = self.simulator.models.get(evt.dest_model)
-            if m:
-                m.handle_event(evt)
+            evt = self.simulator.pop_event()
+            handler = self.simulator.handlers.get(evt.dest_model)
+            if handler:
+                handler(evt)
         
         # 목적함수 계산
         objective = self.simulator.objective()
@@ -1,14 +1,35 @@
 # --- simulator/domain/domain.py ---
 import random
-from enum import Enum, auto
+from enum import IntEnum
 
-class JobStatus(Enum):
-    QUEUED = auto()
-    RUNNING = auto()
-    TRANSFER = auto()
-    DONE = auto()
+class JobStatus(IntEnum):  # 비교는 정수 비교, 값은 상태별 배열 인덱스로도 사용 가능
+    QUEUED = 0
+    RUNNING = 1
+    TRANSFER = 2
+    DONE = 3
+
+# Enum.name은 매번 프로퍼티를 거치므로 값(인덱스)으로 바로 읽는 이름 표
+JOB_STATUS_NAMES = tuple(s.name for s in JobStatus)
+
+def _duration_sampler(d):
+    """분포 dict를 인자 없는 샘플러로 변환 (분포 종류 분기는 생성 시 한 번만, 알 수 없는 분포면 None)"""
+    t = d.get('distribution')
+    if t == 'normal':
+        mean, std = d['mean'], d['std']
+        return lambda: max(0, random.gauss(mean, std))
+    if t == 'uniform':
+        low, high = d['low'], d['high']
+        return lambda: random.uniform(low, high)
+    if t == 'exponential':
+        rate = d['rate']
+        return lambda: random.expovariate(rate)
+    return None
 
 class Operation:
+    __slots__ = ('id', 'assigned_machine', 'candidates', 'first_candidate', 'distribution', '_sampler',
+                 'machine', 'start_time', 'end_time', 'duration', 'agv_pickup_time', 'agv_pickup_end_time', 'agv_delivery_start_time',
+                 'agv_delivery_end_time', 'agv_unload_start_time', 'agv_unload_end_time')
+
     def __init__(self, op_id, assigned_machine, candidate_machines, distribution):
         """
         :param op_id: Operation ID
@@ -19,9 +40,13 @@ class Operation:
         self.id = op_id
         self.assigned_machine = assigned_machine
         self.candidates = candidate_machines
+        # 기본 휴리스틱이 쓰는 첫 번째 후보 기계 (없으면 None)
+        self.first_candidate = candidate_machines[0] if candidate_machines else None
         self.distribution = distribution
+        self._sampler = _duration_sampler(distribution)
         
         # 수학적 검증을 위한 시간 추적
+        self.machine = None         # 실제로 가공한 기계 (동적 모드에서는 시작할 때 정해짐)
         self.start_time = None      # s_{i,j}: 작업 시작 시간
         self.end_time = None        # e_{i,j}: 작업 완료 시간
         self.duration = None        # p_{i,j,m}: 실제 처리 시간
@@ -42,15 +67,10 @@ class Operation:
         return self.assigned_machine
 
     def sample_duration(self, machine_id=None):
-        d = self.distribution
-        t = d['distribution']
-        if t == 'normal':
-            return max(0, random.gauss(d['mean'], d['std']))
-        if t == 'uniform':
-            return random.uniform(d['low'], d['high'])
-        if t == 'exponential':
-            return random.expovariate(d['rate'])
-        raise RuntimeError('Unknown distribution')
+        sampler = self._sampler
+        if sampler is None:
+            raise RuntimeError('Unknown distribution')
+        return sampler()
     
     def set_start_time(self, time):
         """작업 시작 시간 설정"""
@@ -108,6 +128,7 @@ class Job:
         self.part_id = part_id
         self.ops = operations
         self.idx = 0
+        self._current_op = operations[0] if operations else None  # idx가 바뀔 때만 갱신
         self.release_time = release_time
         
         # 상태 관리
@@ -123,11 +144,15 @@ class Job:
         self.agv_transfer_times = {}  # AGV 전송 시간 추적
 
     def current_op(self):
-        return self.ops[self.idx] if self.idx < len(self.ops) else None
+        return self._current_op
+
+    def _sync_current_op(self):
+        self._current_op = self.ops[self.idx] if self.idx < len(self.ops) else None
 
     def advance(self):
         self.idx += 1
         self.completed_operations += 1
+        self._sync_current_op()
 
     def done(self):
         return self.idx >= len(self.ops)
@@ -212,7 +237,7 @@ class Job:
         return {
             'job_id': self.id,
             'part_id': self.part_id,
-            'status': self.status.name,
+            'status': JOB_STATUS_NAMES[self.status],
             'current_location': self.current_location,
             'last_completion_time': self.last_completion_time,
             'total_operations': self.total_operations,
@@ -235,12 +260,15 @@ class Job:
     
     def restore_state(self, state):
         self.idx = state['idx']
+        self._sync_current_op()
         self.status = state['status']
         self.current_location = state['current_location']
         self.last_completion_time = state['last_completion_time']
         self.completed_operations = state['completed_operations']
 
 class Part:
+    __slots__ = ('id', 'job', 'status')
+
     def __init__(self, part_id, job):
         """
         :param part_id: Part identifier
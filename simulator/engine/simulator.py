@@ -1,7 +1,10 @@
 # --- simulator/engine/simulator.py ---
 import heapq
-import copy
+import itertools
+import io
+import sys
 import random
+from collections import deque
 from enum import Enum, auto
 
 class DecisionEpoch(Enum):
@@ -10,6 +13,8 @@ class DecisionEpoch(Enum):
     OPERATION_COMPLETE = auto()
 
 class Action:
+    __slots__ = ('operation_id', 'machine_id', 'insert_position')
+
     def __init__(self, operation_id, machine_id, insert_position=None):
         self.operation_id = operation_id
         self.machine_id = machine_id
@@ -36,9 +41,6 @@ class Event:
         self.src_model = None
         self.dest_model = dest_model
 
-    def __lt__(self, other):
-        return self.time < other.time
-
     def set_src(self, name):
         self.src_model = name
 
@@ -48,24 +50,88 @@ class Event:
     def __repr__(self):
         return f"Event(time={self.time:.2f}, type={self.event_type}, from={self.src_model}, to={self.dest_model}, payload={self.payload})"
 
-class EoModel:
-    push_event = None
-    get_time = None
+class EventQueue:
+    """
+    미래 이벤트 목록 (FEL)
+    현재 시각에 예약된 이벤트(지연 0)는 FIFO 레인(deque)에, 이후 시각의 이벤트는 힙에 보관한다.
+    힙 항목은 (time, seq, event) 튜플로, 같은 시각이면 삽입 순서(seq)대로 꺼낸다.
+    """
+    __slots__ = ('_heap', '_lane', '_seq', 'now')
+
+    def __init__(self, now=0.0):
+        self._heap = []
+        self._lane = deque()
+        self._seq = itertools.count()
+        self.now = now  # 마지막으로 꺼낸 이벤트 시각
+
+    def push(self, event):
+        if event.time == self.now:
+            self._lane.append(event)
+        else:
+            heapq.heappush(self._heap, (event.time, next(self._seq), event))
+
+    def push_many(self, events):
+        """여러 이벤트를 한 번에 추가 (힙은 heapify 한 번으로 재구성, 순서는 push를 반복한 것과 동일)"""
+        heap = self._heap
+        now = self.now
+        seq = self._seq
+        for event in events:
+            if event.time == now:
+                self._lane.append(event)
+            else:
+                heap.append((event.time, next(seq), event))
+        heapq.heapify(heap)
+
+    def pop(self):
+        heap = self._heap
+        # 같은 시각이면 먼저 예약된 힙 쪽 이벤트가 우선
+        if heap and (not self._lane or heap[0][0] <= self.now):
+            event = heapq.heappop(heap)[2]
+        else:
+            event = self._lane.popleft()
+        self.now = event.time
+        return event
 
-    @classmethod
-    def bind(cls, push_fn, time_fn):
-        cls.push_event = push_fn
-        cls.get_time = time_fn
+    def __len__(self):
+        return len(self._heap) + len(self._lane)
+
+    def __bool__(self):
+        return bool(self._heap) or bool(self._lane)
+
+    def __iter__(self):
+        # 꺼내질 순서대로 순회 (스냅샷 복원 시 같은 시각 이벤트의 순서 보존)
+        for _, _, event in sorted(self._heap):
+            yield event
+        yield from self._lane
+
+class EoModel:
+    # 시뮬레이터는 모델마다 등록 시 바인딩 (클래스 전역 상태가 없어 여러 Simulator를 동시에 써도 섞이지 않음)
+    __slots__ = ('name', 'sim')
 
     def __init__(self, name):
         self.name = name
+        self.sim = None
 
     def schedule(self, event, delay=0.0):
-        if not EoModel.push_event:
+        sim = self.sim
+        if sim is None:
             raise RuntimeError("Simulator not bound")
         event.set_src(self.name)
-        event.set_time(EoModel.get_time() + delay)
-        EoModel.push_event(event)
+        event.set_time(sim.current_time + delay)
+        sim.push(event)
+
+    def schedule_many(self, scheduled):
+        """(event, delay) 목록을 한 번에 예약"""
+        sim = self.sim
+        if sim is None:
+            raise RuntimeError("Simulator not bound")
+        now = sim.current_time
+        events = []
+        for event, delay in scheduled:
+            event.set_src(self.name)
+            event.set_time(now + delay)
+            events.append(event)
+        sim.push_many(events)
 
     def handle_event(self, event):
         raise NotImplementedError
@@ -73,22 +139,35 @@ class EoModel:
 class Simulator:
     def __init__(self):
         self.current_time = 0.0
-        self.event_queue = []
+        self.event_queue = EventQueue()
         self.models = {}
+        self.handlers = {}  # 모델 이름 -> handle_event (이벤트마다 메서드 속성 조회를 하지 않도록 등록 시 한 번만 바인딩)
         self.machines = []  # 기계 목록 저장
         self.decision_epochs = []  # 결정 시점들
         self.best_objective = float('inf')
         self.best_schedule = None
-        EoModel.bind(self.push, self.now)
+        self.verbose = False  # 탐색용 API(legal_actions/apply) 디버그 출력 여부
 
     def push(self, event):
-        heapq.heappush(self.event_queue, event)
+        self.event_queue.push(event)
+
+    def push_many(self, events):
+        """초기 릴리스처럼 많은 이벤트를 한 번에 FEL에 넣음 (즉시 전달 없이 모두 큐에 추가)"""
+        self.event_queue.push_many(events)
+
+    def pop_event(self):
+        """다음 이벤트를 꺼내고 시뮬레이션 시간을 그 시각으로 이동"""
+        evt = self.event_queue.pop()
+        self.current_time = evt.time
+        return evt
 
     def now(self):
         return self.current_time
 
     def register(self, model):
         self.models[model.name] = model
+        self.handlers[model.name] = model.handle_event
+        model.sim = self
         # 기계 모델인 경우 별도로 저장
         if hasattr(model, 'queued_jobs'):
             self.machines.append(model)
@@ -97,7 +176,11 @@ class Simulator:
         """현재 시뮬레이터 상태의 스냅샷을 생성합니다 (최적화된 버전)."""
         # 이벤트 큐 복사 (최소한의 정보만)
         event_queue_copy = []
+        transit_jobs_state = []  # 이동 중이라 어느 기계에도 없는 Job (이벤트 payload에만 있음)
         for event in self.event_queue:
+            part = event.payload.get('part') if event.payload else None
+            if part is not None:
+                transit_jobs_state.append(part.job.save_state())
             # 이벤트의 핵심 정보만 복사
             event_copy = Event(
                 event.event_type,
@@ -122,7 +205,9 @@ class Simulator:
                 'queued_jobs': queued_jobs_state,
                 'running_jobs': running_jobs_state,
                 'finished_jobs': finished_jobs_state,
-                'transfer_counts': copy.deepcopy(getattr(machine, 'transfer_counts', {}))
+                'transfer_counts': dict(getattr(machine, 'transfer_counts', {})),  # 값이 int라 얕은 복사로 충분
+                'sampler_state': machine.save_sampler_state() if hasattr(machine, 'save_sampler_state') else None,
+                'queue_state': machine.save_queue_state() if hasattr(machine, 'save_queue_state') else None
             }
         
         # RNG 상태 저장
@@ -131,7 +216,7 @@ class Simulator:
         return SimulatorState(
             self.current_time,
             event_queue_copy,
-            {},  # models_state는 비움 (기계 상태에 포함됨)
+            {'transit_jobs': transit_jobs_state},  # 그 외 모델 상태는 기계 상태에 포함됨
             machines_state,
             rng_state
         )
@@ -140,59 +225,77 @@ class Simulator:
         """스냅샷에서 상태를 복원합니다 (최적화된 버전)."""
         self.current_time = state.current_time
         
-        # 이벤트 큐 복원
-        self.event_queue = []
+        # 이벤트 큐 복원 (기계별로 남아 있는 idle_check 릴리스 시각도 함께 수집)
+        self.event_queue = EventQueue(state.current_time)
+        idle_checks = {}
+        job_dict = {}  # Job ID로 빠른 검색을 위한 딕셔너리 (이동 중인 Job 포함)
         for event in state.event_queue:
             self.push(event)
+            if event.event_type == 'machine_idle_check':
+                idle_checks.setdefault(event.dest_model, []).append(event.payload.get('release_time'))
+            part = event.payload.get('part') if event.payload else None
+            if part is not None:
+                job_dict[part.job.id] = part.job
+        
+        # 이동 중인 Job 상태 복원
+        for job_state in state.models_state.get('transit_jobs', ()):
+            job = job_dict.get(job_state['job_id'])
+            if job is not None:
+                job.restore_state(job_state)
+        
+        # 기계에 있는 Job과 기계 이름도 딕셔너리에 한 번만 모아 둠
+        for m in self.machines:
+            for job in m.queued_jobs:
+                job_dict[job.id] = job
+            for job in m.running_jobs:
+                job_dict[job.id] = job
+            for job in m.finished_jobs:
+                job_dict[job.id] = job
+        machine_dict = {m.name: m for m in self.machines}
         
         # 기계 상태 복원 (Job 객체들을 찾아서 상태만 복원)
         for machine_name, machine_state in state.machines_state.items():
-            for machine in self.machines:
-                if machine.name == machine_name:
-                    machine.status = machine_state['status']
-                    machine.next_available_time = machine_state['next_available_time']
-                    if 'transfer_counts' in machine_state:
-                        machine.transfer_counts = machine_state['transfer_counts']
-                    
-                    # 모든 Job 객체들을 수집 (한 번만)
-                    all_jobs = []
-                    for m in self.machines:
-                        all_jobs.extend(m.queued_jobs)
-                        all_jobs.extend(m.running_jobs)
-                        all_jobs.extend(m.finished_jobs)
-                    
-                    # Job 상태 복원 (최적화된 방식)
-                    machine.queued_jobs = []
-                    machine.running_jobs = []
-                    machine.finished_jobs = []
-                    
-                    # Job ID로 빠른 검색을 위한 딕셔너리 생성
-                    job_dict = {job.id: job for job in all_jobs}
-                    
-                    # queued_jobs 복원
-                    for job_state in machine_state['queued_jobs']:
-                        job_id = job_state.get('job_id', job_state.get('id'))
-                        if job_id in job_dict:
-                            job = job_dict[job_id]
-                            job.restore_state(job_state)
-                            machine.queued_jobs.append(job)
-                    
-                    # running_jobs 복원
-                    for job_state in machine_state['running_jobs']:
-                        job_id = job_state.get('job_id', job_state.get('id'))
-                        if job_id in job_dict:
-                            job = job_dict[job_id]
-                            job.restore_state(job_state)
-                            machine.running_jobs.append(job)
-                    
-                    # finished_jobs 복원
-                    for job_state in machine_state['finished_jobs']:
-                        job_id = job_state.get('job_id', job_state.get('id'))
-                        if job_id in job_dict:
-                            job = job_dict[job_id]
-                            job.restore_state(job_state)
-                            machine.finished_jobs.append(job)
-                    break
+            machine = machine_dict.get(machine_name)
+            if machine is not None:
+                machine.status = machine_state['status']
+                machine.next_available_time = machine_state['next_available_time']
+                if 'transfer_counts' in machine_state:
+                    machine.transfer_counts = dict(machine_state['transfer_counts'])  # 스냅샷은 여러 번 복원되므로 복사본 사용
+                if hasattr(machine, 'restore_sampler_state'):
+                    machine.restore_sampler_state(machine_state.get('sampler_state'))
+                if machine_state.get('queue_state') is not None:
+                    machine.restore_queue_state(machine_state['queue_state'])
+                if hasattr(machine, 'restore_idle_checks'):
+                    machine.restore_idle_checks(idle_checks.get(machine_name, ()))
+                
+                # Job 상태 복원 (최적화된 방식)
+                machine.queued_jobs = {}
+                machine.running_jobs = {}
+                machine.finished_jobs = {}
+                
+                # queued_jobs 복원
+                for job_state in machine_state['queued_jobs']:
+                    job_id = job_state.get('job_id', job_state.get('id'))
+                    if job_id in job_dict:
+                        job = job_dict[job_id]
+                        job.restore_state(job_state)
+                        machine.queued_jobs[job] = None
+                
+                # running_jobs 복원
+                for job_state in machine_state['running_jobs']:
+                    job_id = job_state.get('job_id', job_state.get('id'))
+                    if job_id in job_dict:
+                        job = job_dict[job_id]
+                        job.restore_state(job_state)
+                        machine.running_jobs[job] = None
+                
+                # finished_jobs 복원
+                for job_state in machine_state['finished_jobs']:
+                    job_id = job_state.get('job_id', job_state.get('id'))
+                    if job_id in job_dict:
+                        job = job_dict[job_id]
+                        job.restore_state(job_state)
+                        machine.finished_jobs[job] = None
         
         # RNG 상태 복원
         random.setstate(state.rng_state)
@@ -205,10 +308,12 @@ class Simulator:
         # 모든 기계의 큐에 있는 작업들에 대해 가능한 모든 액션 생성
         for machine in self.machines:
             if machine.queued_jobs:  # 큐에 작업이 있으면
-                print(f"    [DEBUG] {machine.name} 큐에 {len(machine.queued_jobs)}개 작업 있음")
+                if self.verbose:
+                    print(f"    [DEBUG] {machine.name} 큐에 {len(machine.queued_jobs)}개 작업 있음")
                 for job in machine.queued_jobs:
                     current_op = job.current_op()
-                    print(f"    [DEBUG] Job {job.id}의 현재 operation: {current_op.id if current_op else 'None'}")
+                    if self.verbose:
+                        print(f"    [DEBUG] Job {job.id}의 현재 operation: {current_op.id if current_op else 'None'}")
                     if current_op:
                         # 해당 operation이 가능한 모든 기계에 대해 액션 생성
                         for candidate_machine in current_op.candidates:
@@ -217,9 +322,11 @@ class Simulator:
                             if action_key not in action_set:
                                 actions.append(action)
                                 action_set.add(action_key)
-                                print(f"    [DEBUG] 액션 추가: {action_key}")
+                                if self.verbose:
+                                    print(f"    [DEBUG] 액션 추가: {action_key}")
         
-        print(f"    [DEBUG] 총 {len(actions)}개 액션 생성")
+        if self.verbose:
+            print(f"    [DEBUG] 총 {len(actions)}개 액션 생성")
         return actions
 
     def apply(self, action):
@@ -256,8 +363,7 @@ class Simulator:
             })
             
             # job을 source machine에서 제거
-            if target_job in source_machine.queued_jobs:
-                source_machine.queued_jobs.remove(target_job)
+            source_machine.queued_jobs.pop(target_job, None)
             
             # job을 target machine에 추가
             target_machine_obj = None
@@ -269,15 +375,18 @@ class Simulator:
             if target_machine_obj:
                 if action.insert_position is not None:
                     # 지정된 위치에 삽입
-                    target_machine_obj.queued_jobs.insert(action.insert_position, target_job)
+                    jobs = list(target_machine_obj.queued_jobs)
+                    jobs.insert(action.insert_position, target_job)
+                    target_machine_obj.queued_jobs = dict.fromkeys(jobs)
                 else:
                     # 큐 끝에 추가
-                    target_machine_obj.queued_jobs.append(target_job)
+                    target_machine_obj.queued_jobs[target_job] = None
                 
                 # 디버깅 출력
-                print(f"    액션 적용: {operation_id} -> {target_machine}")
-                print(f"    {source_machine.name} 큐 길이: {len(source_machine.queued_jobs)}")
-                print(f"    {target_machine} 큐 길이: {len(target_machine_obj.queued_jobs)}")
+                if self.verbose:
+                    print(f"    액션 적용: {operation_id} -> {target_machine}")
+                    print(f"    {source_machine.name} 큐 길이: {len(source_machine.queued_jobs)}")
+                    print(f"    {target_machine} 큐 길이: {len(target_machine_obj.queued_jobs)}")
         
         return changes
 
@@ -290,41 +399,30 @@ class Simulator:
                 to_machine_name = change['to_machine']
                 original_queue_state = change['original_queue_state']
                 
-                # 모든 기계에서 job 찾기
-                target_job = None
+                # 모든 기계의 job을 ID로 색인 (한 번만 순회)
+                job_dict = {}
                 for machine in self.machines:
-                    for job in machine.queued_jobs + machine.running_jobs + machine.finished_jobs:
-                        if job.id == job_id:
-                            target_job = job
-                            break
-                    if target_job:
-                        break
+                    for job in itertools.chain(machine.queued_jobs, machine.running_jobs, machine.finished_jobs):
+                        job_dict.setdefault(job.id, job)
+                target_job = job_dict.get(job_id)
                 
                 if target_job:
                     # to_machine에서 job 제거
                     for machine in self.machines:
-                        if machine.name == to_machine_name and target_job in machine.queued_jobs:
-                            machine.queued_jobs.remove(target_job)
+                        if machine.name == to_machine_name:
+                            machine.queued_jobs.pop(target_job, None)
                         break
                 
                 # from_machine에 job 복원
                 for machine in self.machines:
                     if machine.name == from_machine_name:
                         # 기존 큐를 비우고 상태에서 복원
-                        machine.queued_jobs = []
+                        machine.queued_jobs = {}
                         for job_state in original_queue_state:
-                            # 모든 기계에서 해당 job 찾기
-                            found_job = None
-                            for m in self.machines:
-                                for job in m.queued_jobs + m.running_jobs + m.finished_jobs:
-                                    if job.id == job_state['job_id']:
-                                        found_job = job
-                                        break
-                                if found_job:
-                                    break
+                            found_job = job_dict.get(job_state['job_id'])
                             if found_job:
                                 found_job.restore_state(job_state)
-                                machine.queued_jobs.append(found_job)
+                                machine.queued_jobs[found_job] = None
                         break
 
     def is_terminal(self):
@@ -417,12 +515,15 @@ class Simulator:
         # 상태 복원
         self.restore(original_state)
         
-        print(f"    롤아웃 완료: 정책={policy}, 상한={upper_bound}")
+        if self.verbose:
+            print(f"    롤아웃 완료: 정책={policy}, 상한={upper_bound}")
         return upper_bound
 
     def _run_heuristic_simulation(self, policy):
         """휴리스틱 정책으로 시뮬레이션을 실행합니다."""
-        print(f"    휴리스틱 시뮬레이션 시작: 정책={policy}")
+        verbose = self.verbose
+        if verbose:
+            print(f"    휴리스틱 시뮬레이션 시작: 정책={policy}")
         
         # 시뮬레이터 기반 최적화 전용 간단한 휴리스틱
         max_iterations = 1000  # 무한 루프 방지
@@ -433,20 +534,14 @@ class Simulator:
             
             # 다음 이벤트 처리
             if self.event_queue:
-                evt = heapq.heappop(self.event_queue)
-                self.current_time = evt.time
-                print(f"    이벤트 처리: {evt.event_type} at {evt.time}")
+                evt = self.pop_event()
+                if verbose:
+                    print(f"    이벤트 처리: {evt.event_type} at {evt.time}")
                 
-                # 이벤트를 해당 모델로 전달
-                if hasattr(evt, 'dest_model') and evt.dest_model:
-                    target_model = None
-                    for model in self.models:
-                        if hasattr(model, 'name') and model.name == evt.dest_model:
-                            target_model = model
-                            break
-                    
-                    if target_model:
-                        target_model.handle(evt)
+                # 이벤트를 해당 모델로만 전달 (이름으로 바로 조회)
+                handler = self.handlers.get(evt.dest_model)
+                if handler is not None:
+                    handler(evt)
             
             # 결정 시점에서 휴리스틱 적용
             if policy == "ECT":
@@ -454,7 +549,8 @@ class Simulator:
             elif policy == "SPT":
                 self._apply_spt_policy()
         
-        print(f"    휴리스틱 시뮬레이션 완료: 현재시간={self.current_time}, 터미널={self.is_terminal()}, 반복횟수={iteration}")
+        if verbose:
+            print(f"    휴리스틱 시뮬레이션 완료: 현재시간={self.current_time}, 터미널={self.is_terminal()}, 반복횟수={iteration}")
         
         if self.is_terminal():
             return self.objective()
@@ -462,7 +558,7 @@ class Simulator:
             # 터미널이 아닌 경우 현재 시간 + 예상 완료 시간을 반환
             estimated_completion = self.current_time
             for machine in self.machines:
-                for job in machine.queued_jobs + machine.running_jobs:
+                for job in itertools.chain(machine.queued_jobs, machine.running_jobs):
                     remaining_ops = job.get_remaining_operations()
                     estimated_completion += remaining_ops * 5.0  # 평균 작업 시간 추정
             return estimated_completion
@@ -488,10 +584,11 @@ class Simulator:
                 
                 if best_job:
                     # 작업 시작
-                    machine.running_jobs.append(best_job)
-                    machine.queued_jobs.remove(best_job)
+                    machine.running_jobs[best_job] = None
+                    del machine.queued_jobs[best_job]
                     machine.status = 'busy'
-                    print(f"    ECT 정책: {best_job.id}를 {machine.name}에서 시작")
+                    if self.verbose:
+                        print(f"    ECT 정책: {best_job.id}를 {machine.name}에서 시작")
                     
                     # 작업 완료 이벤트 스케줄링
                     current_op = best_job.current_op()
@@ -501,8 +598,8 @@ class Simulator:
                         
                         # 작업 완료 이벤트 생성
                         evt = Event('end_operation', {'job': best_job, 'operation': current_op.id}, dest_model=machine.name)
-                        self.push(evt)
                         evt.set_time(completion_time)
+                        self.push(evt)
 
     def _apply_spt_policy(self):
         """SPT (Shortest Processing Time) 정책을 적용합니다."""
@@ -522,8 +619,8 @@ class Simulator:
                 
                 if best_job:
                     # 작업 시작
-                    machine.running_jobs.append(best_job)
-                    machine.queued_jobs.remove(best_job)
+                    machine.running_jobs[best_job] = None
+                    del machine.queued_jobs[best_job]
                     machine.status = 'busy'
 
     def print_machine_queues(self):
@@ -531,9 +628,11 @@ class Simulator:
         if not self.machines:
             return
             
-        print(f"\n=== 시뮬레이션 시간: {self.current_time:.2f} ===")
+        buf = io.StringIO()
+        print(f"\n=== 시뮬레이션 시간: {self.current_time:.2f} ===", file=buf)
         for machine in self.machines:
-            machine.get_queue_status()
+            machine.get_queue_status(out=buf)
+        sys.stdout.write(buf.getvalue())
 
     def get_all_job_status(self):
         """모든 기계에서 관리하는 Job들의 상태를 수집하여 반환합니다."""
@@ -587,10 +686,10 @@ class Simulator:
         """
         last_print_time = 0.0
         last_summary_time = 0.0
+        handlers = self.handlers
         
         while self.event_queue:
-            evt = heapq.heappop(self.event_queue)
-            self.current_time = evt.time
+            evt = self.pop_event()
             
             # 주기적으로 큐 상태 출력
             if print_queues_interval and self.current_time - last_print_time >= print_queues_interval:
@@ -602,10 +701,10 @@ class Simulator:
                 self.print_job_status_summary()
                 last_summary_time = self.current_time
             
-            m = self.models.get(evt.dest_model)
-            if not m:
+            handler = handlers.get(evt.dest_model)
+            if handler is None:
                 raise KeyError(f"No model: {evt.dest_model}")
-            m.handle_event(evt)
+            handler(evt)
 
     def validate_mathematical_constraints(self):
         """수학적 검증식을 검증합니다."""
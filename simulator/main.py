@@ -1,21 +1,33 @@
 # --- simulator/main.py ---
 from simulator.engine.simulator import Simulator
 from simulator.builder import ModelBuilder
+from simulator.result.recorder import Recorder
+from simulator.domain.domain import JobStatus
 import pandas as pd
 import os
+import io
 import sys
 import json
+import logging
 import argparse
 
-def print_all_machine_queues(machines):
-    """모든 기계의 큐 상태를 출력"""
-    print("\n" + "="*50)
-    print("모든 기계의 큐 상태")
-    print("="*50)
+# 결과 디렉토리는 모듈 로드 시 한 번만 생성
+RESULTS_DIR = 'results'
+os.makedirs(RESULTS_DIR, exist_ok=True)
+
+def print_all_machine_queues(machines, verbose=True):
+    """모든 기계의 큐 상태를 출력 (버퍼에 모아서 한 번에 기록, verbose=False면 생략)"""
+    if not verbose:
+        return
+    buf = io.StringIO()
+    print("\n" + "="*50, file=buf)
+    print("모든 기계의 큐 상태", file=buf)
+    print("="*50, file=buf)
     for machine in machines:
-        machine.get_queue_status()
+        machine.get_queue_status(out=buf)
+    sys.stdout.write(buf.getvalue())
 
-def save_all_job_info(machines, filename='results/job_info.csv'):
+def save_all_job_info(machines, filename=os.path.join(RESULTS_DIR, 'job_info.csv')):
     """모든 Job의 정보를 CSV 파일로 저장"""
     all_jobs = []
     for machine in machines:
@@ -41,7 +53,6 @@ def save_all_job_info(machines, filename='results/job_info.csv'):
             all_jobs.append(job_dict)
     
     if all_jobs:
-        os.makedirs('results', exist_ok=True)
         df = pd.DataFrame(all_jobs)
         df.to_csv(filename, index=False)
         print(f"[저장 완료] {filename}")
@@ -49,15 +60,16 @@ def save_all_job_info(machines, filename='results/job_info.csv'):
     else:
         print("[경고] 저장할 Job 정보가 없습니다.")
 
-def save_all_operation_info(machines, filename='results/operation_info.csv'):
+def save_all_operation_info(machines, filename=os.path.join(RESULTS_DIR, 'operation_info.csv')):
     """기존 호환성을 위한 함수 - Job 정보를 Operation 형태로 변환하여 저장"""
     all_ops = []
     for machine in machines:
         # 실행 중인 Job들에서 현재 Operation 정보 추출
         for job in machine.running_jobs:
-            if job.current_op():
+            op = job.current_op()
+            if op:
                 op_dict = {
-                    'operation_id': job.current_op().id,
+                    'operation_id': op.id,
                     'job_id': job.id,
                     'status': job.status.name,
                     'location': job.current_location,
@@ -81,7 +93,36 @@ def save_all_operation_info(machines, filename='results/operation_info.csv'):
                 all_ops.append(op_dict)
     
     if all_ops:
-        os.makedirs('results', exist_ok=True)
+        df = pd.DataFrame(all_ops)
+        df.to_csv(filename, index=False)
+        print(f"[저장 완료] {filename}")
+    else:
+        print("[경고] 저장할 operation 정보가 없습니다.")
+
+def _operation_status(op):
+    """operation_info.csv의 status 값 (save_all_operation_info와 같은 값을 사용)"""
+    if op is None or op.start_time is None:
+        return JobStatus.QUEUED.name
+    if op.end_time is None:
+        return JobStatus.RUNNING.name
+    return 'completed'
+
+def save_operation_info_from_schedule(best_schedule, jobs, filename=os.path.join(RESULTS_DIR, 'operation_info.csv')):
+    """최적 스케줄(Action 목록) 순서로 Operation 정보를 저장 (시각/위치는 시뮬레이션된 Operation에서)"""
+    op_index = {op.id: (job.id, op) for job in jobs.values() for op in job.ops}
+    all_ops = []
+    for action in best_schedule:
+        job_id, op = op_index.get(action.operation_id, (None, None))
+        all_ops.append({
+            'operation_id': action.operation_id,
+            'job_id': job_id,
+            'status': _operation_status(op),
+            'location': op.machine if op is not None else None,
+            'input_timestamp': op.start_time if op is not None else None,
+            'output_timestamp': op.end_time if op is not None else None
+        })
+    
+    if all_ops:
         df = pd.DataFrame(all_ops)
         df.to_csv(filename, index=False)
         print(f"[저장 완료] {filename}")
@@ -98,9 +139,16 @@ if __name__ == '__main__':
                        help='최대 탐색 노드 수 (기본값: 10000)')
     parser.add_argument('--scenario', default='scenarios/my_case', 
                        help='시나리오 경로 (기본값: scenarios/my_case)')
+    parser.add_argument('--with_xlsx', action='store_true',
+                       help='trace.csv, AGV 로그 CSV 외에 xlsx 파일도 저장 (기본값: CSV만 저장)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='최적화 탐색 및 기계/AGV 이벤트 단위 로그 출력')
     
     args = parser.parse_args()
     
+    # 모델 이벤트 로그(logger.debug)는 --verbose일 때만 출력
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(message)s')
+    
     scenario_path = args.scenario
     
     print("="*60)
@@ -124,7 +172,6 @@ if __name__ == '__main__':
     
     # 모델 등록
     for m in machines:
-        m.simulator = sim  # 시뮬레이터 참조 설정
         sim.register(m)
     sim.register(gen)
     sim.register(tx)
@@ -132,35 +179,39 @@ if __name__ == '__main__':
     # Generator 초기화 (이벤트 생성)
     gen.initialize()
     
-    # 최적화 실행
+    # 최적화 실행 (탐색 루프 내부 출력은 --verbose일 때만)
+    sim.verbose = args.verbose
     optimizer = SimulatorBasedOptimizer(
         simulator=sim,
         algorithm=SearchAlgorithm.BRANCH_AND_BOUND,
         time_limit=args.time_limit,
         max_nodes=args.max_nodes,
-        seed=42
+        seed=42,
+        verbose=args.verbose
     )
     
     print("\n시뮬레이터 기반 최적화 시작...")
-    result = optimizer.optimize()
+    # 탐색 중 롤아웃은 trace에 기록하지 않고, 최종 시뮬레이션만 기록
+    Recorder.enabled = False
+    try:
+        result = optimizer.optimize()
+    finally:
+        Recorder.enabled = True
     
     # 결과 출력
     optimizer.print_search_summary(result)
     
     # 결과를 JSON 파일로 저장
-    import json
-    os.makedirs('results', exist_ok=True)
-    
     result_dict = {
         'algorithm': result.algorithm.name,
         'best_objective': result.best_objective,
         'search_time': result.search_time,
         'nodes_explored': result.nodes_explored,
-        'best_schedule': [str(action) for action in result.best_schedule],
+        'best_schedule': list(map(str, result.best_schedule)),
         'search_log': result.search_log
     }
     
-    with open('results/simulator_optimization_result.json', 'w') as f:
+    with open(os.path.join(RESULTS_DIR, 'simulator_optimization_result.json'), 'w') as f:
         json.dump(result_dict, f, indent=2)
     
     print(f"\n결과가 results/simulator_optimization_result.json에 저장되었습니다.")
@@ -178,7 +229,6 @@ if __name__ == '__main__':
         
         # 모델 등록
         for m in machines:
-            m.simulator = sim  # 시뮬레이터 참조 설정
             sim.register(m)
         sim.register(gen)
         sim.register(tx)
@@ -203,11 +253,12 @@ if __name__ == '__main__':
         print("- Operation 중복 문제: 유연한 스케줄링을 위한 의도된 설계")
         print("- 수학적 검증식을 만족하는 시간 추적 기능이 구현됨")
 
-        # transducer finalize 호출하여 trace.xlsx 생성
-        tx.finalize()
+        # transducer finalize 호출하여 trace.csv (옵션: trace.xlsx) 생성
+        tx.finalize(with_xlsx=args.with_xlsx)
         
-        print(f"\n=== 시뮬레이터 기반 최적화 결과로 생성된 trace.xlsx ===")
-        print("results/trace.xlsx 파일이 생성되었습니다.")
+        if args.with_xlsx:
+            print(f"\n=== 시뮬레이터 기반 최적화 결과로 생성된 trace.xlsx ===")
+            print("results/trace.xlsx 파일이 생성되었습니다.")
     else:
         print("\n최적 스케줄이 없어서 기본 시뮬레이션을 실행합니다...")
         
@@ -218,7 +269,6 @@ if __name__ == '__main__':
         sim.register(gen)
         sim.register(tx)
         for m in machines:
-            m.simulator = sim  # 시뮬레이터 참조 설정
             sim.register(m)
         gen.initialize()
         
@@ -241,21 +291,25 @@ if __name__ == '__main__':
         print("- Operation 중복 문제: 유연한 스케줄링을 위한 의도된 설계")
         print("- 수학적 검증식을 만족하는 시간 추적 기능이 구현됨")
 
-        # transducer finalize 호출하여 trace.xlsx 생성
-        tx.finalize()
+        # transducer finalize 호출하여 trace.csv (옵션: trace.xlsx) 생성
+        tx.finalize(with_xlsx=args.with_xlsx)
         
-        print(f"\n=== 기본 시뮬레이션으로 생성된 trace.xlsx ===")
-        print("results/trace.xlsx 파일이 생성되었습니다.")
+        if args.with_xlsx:
+            print(f"\n=== 기본 시뮬레이션으로 생성된 trace.xlsx ===")
+            print("results/trace.xlsx 파일이 생성되었습니다.")
     
     # 결과 파일명 설정
-    job_info_file = 'results/job_info.csv'
-    operation_info_file = 'results/operation_info.csv'
+    job_info_file = os.path.join(RESULTS_DIR, 'job_info.csv')
+    operation_info_file = os.path.join(RESULTS_DIR, 'operation_info.csv')
     
     # 모든 Job 정보 저장
     save_all_job_info(machines, job_info_file)
     
-    # 기존 호환성을 위한 Operation 정보 저장
-    save_all_operation_info(machines, operation_info_file)
+    # Operation 정보 저장 (최적 스케줄이 있으면 기계 순회 없이 스케줄에서 바로 변환)
+    if result.best_schedule:
+        save_operation_info_from_schedule(result.best_schedule, gen.jobs, operation_info_file)
+    else:
+        save_all_operation_info(machines, operation_info_file)
     
     print("\n" + "="*60)
     print("시뮬레이션 완료!")
@@ -264,21 +318,23 @@ if __name__ == '__main__':
     print(f"- {job_info_file}: Job 정보")
     print(f"- {operation_info_file}: Operation 정보")
     print(f"- results/trace.csv: 시뮬레이션 이벤트 로그")
-    print(f"- results/trace.xlsx: 시뮬레이션 이벤트 로그 (Excel)")
+    if args.with_xlsx:
+        print(f"- results/trace.xlsx: 시뮬레이션 이벤트 로그 (Excel)")
     print(f"- results/simulator_optimization_result.json: 최적화 결과")
     print(f"- 시뮬레이터 기반 최적화 스케줄링 완료")
     print("="*60)
 
     print(f"\n=== 결과 파일 생성 완료 ===")
     print(f"- results/simulator_optimization_result.json: 최적화 결과")
-    print(f"- results/trace.xlsx: 시뮬레이션 추적 로그 (Excel)")
+    if args.with_xlsx:
+        print(f"- results/trace.xlsx: 시뮬레이션 추적 로그 (Excel)")
     
     # AGV 로그 저장
     print(f"\n=== AGV 로그 저장 중 ===")
     agv_files_saved = []
     for machine in machines:
         if hasattr(machine, 'save_agv_logs'):
-            agv_log_file = machine.save_agv_logs('results')
+            agv_log_file = machine.save_agv_logs(RESULTS_DIR, with_xlsx=args.with_xlsx)
             if agv_log_file:
                 agv_files_saved.append(agv_log_file)
     
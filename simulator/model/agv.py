@@ -1,9 +1,12 @@
 # --- simulator/model/agv.py ---
 from simulator.engine.simulator import EoModel, Event
-from enum import Enum, auto
+from enum import IntEnum, auto
+import logging
 import math
 
-class AGVStatus(Enum):
+logger = logging.getLogger(__name__)
+
+class AGVStatus(IntEnum):  # 상태 비교를 정수 비교로
     IDLE = auto()          # 유휴 상태
     FETCHING = auto()      # 머신에서 작업 가져오는 중
     LOADING = auto()       # 작업을 AGV에 적재 중
@@ -11,6 +14,13 @@ class AGVStatus(Enum):
     UNLOADING = auto()     # 목적지에서 작업 하역 중
 
 class AGV(EoModel):
+    __slots__ = ('agv_id', 'speed', 'capacity', 'status', 'current_location', 'destination',
+                 'carried_jobs', 'current_task', 'departure_time', 'arrival_time', 'distance',
+                 'logger', 'task_start_time', '_handlers')
+
+    # (출발 머신, 도착 머신) -> 거리 테이블 (모든 AGV가 공유)
+    _DIST = {}
+
     def __init__(self, agv_id, speed=1.0, capacity=1):
         super().__init__(f"AGV_{agv_id}")
         self.agv_id = agv_id
@@ -23,7 +33,7 @@ class AGV(EoModel):
         self.destination = None       # 목적지 (머신 이름)
         
         # 작업 관리
-        self.carried_jobs = []       # 현재 운반 중인 작업들
+        self.carried_jobs = set()    # 현재 운반 중인 작업들 (추가/제거 O(1))
         self.current_task = None     # 현재 수행 중인 작업
         
         # 이동 관련
@@ -35,6 +45,15 @@ class AGV(EoModel):
         self.logger = None  # AGVLogger 인스턴스
         self.task_start_time = None  # 현재 작업 시작 시간
         
+        # 이벤트 타입별 핸들러 (payload를 인자로 받음)
+        self._handlers = {
+            'agv_fetch_request': self._handle_fetch_request,
+            'agv_delivery_request': self._handle_delivery_request,
+            'agv_fetch_complete': self._handle_fetch_complete,
+            'agv_delivery_complete': self._handle_delivery_complete,
+            'agv_move_complete': self._handle_move_complete,
+        }
+        
     def set_logger(self, logger):
         """로거 설정"""
         self.logger = logger
@@ -81,27 +100,20 @@ class AGV(EoModel):
         
     def handle_event(self, event):
         """이벤트 처리"""
-        if event.event_type == 'agv_fetch_request':
-            self._handle_fetch_request(event.payload)
-        elif event.event_type == 'agv_delivery_request':
-            self._handle_delivery_request(event.payload)
-        elif event.event_type == 'agv_fetch_complete':
-            self._handle_fetch_complete(event.payload)
-        elif event.event_type == 'agv_delivery_complete':
-            self._handle_delivery_complete(event.payload)
-        elif event.event_type == 'agv_move_complete':
-            self._handle_move_complete(event.payload)
+        handler = self._handlers.get(event.event_type)
+        if handler:
+            handler(event.payload)
     
     def _handle_fetch_request(self, payload):
         """작업 가져오기 요청 처리"""
         if self.status != AGVStatus.IDLE:
-            print(f"[{self.name}] 현재 {self.status.name} 상태로 인해 fetch 요청을 거부합니다.")
+            logger.debug("[%s] 현재 %s 상태로 인해 fetch 요청을 거부합니다.", self.name, self.status.name)
             return
             
         source_machine = payload['source_machine']
         job = payload['job']
         
-        print(f"[{self.name}] {source_machine}에서 Job {job.id} fetch 시작")
+        logger.debug("[%s] %s에서 Job %s fetch 시작", self.name, source_machine, job.id)
         
         # 로깅
         self._log_event('fetch_request', {
@@ -117,7 +129,7 @@ class AGV(EoModel):
         }
         
         # 작업 시작 시간 기록
-        self.task_start_time = EoModel.get_time()
+        self.task_start_time = self.sim.current_time
         
         # AGV를 source machine으로 이동
         self._move_to(source_machine)
@@ -125,13 +137,13 @@ class AGV(EoModel):
     def _handle_delivery_request(self, payload):
         """작업 배송 요청 처리"""
         if self.status != AGVStatus.IDLE:
-            print(f"[{self.name}] 현재 {self.status.name} 상태로 인해 delivery 요청을 거부합니다.")
+            logger.debug("[%s] 현재 %s 상태로 인해 delivery 요청을 거부합니다.", self.name, self.status.name)
             return
             
         destination_machine = payload['destination_machine']
         job = payload['job']
         
-        print(f"[{self.name}] {destination_machine}로 Job {job.id} delivery 시작")
+        logger.debug("[%s] %s로 Job %s delivery 시작", self.name, destination_machine, job.id)
         
         # 로깅
         self._log_event('delivery_request', {
@@ -147,7 +159,7 @@ class AGV(EoModel):
         }
         
         # 작업 시작 시간 기록
-        self.task_start_time = EoModel.get_time()
+        self.task_start_time = self.sim.current_time
         
         # AGV를 destination machine으로 이동
         self._move_to(destination_machine)
@@ -174,11 +186,11 @@ class AGV(EoModel):
         travel_time = self.distance / self.speed
         
         # 출발 시간과 도착 시간 설정
-        current_time = EoModel.get_time()
+        current_time = self.sim.current_time
         self.departure_time = current_time
         self.arrival_time = current_time + travel_time
         
-        print(f"[{self.name}] {self.current_location} → {destination} 이동 시작 (거리: {self.distance:.2f}m, 시간: {travel_time:.2f}초)")
+        logger.debug("[%s] %s → %s 이동 시작 (거리: %.2fm, 시간: %.2f초)", self.name, self.current_location, destination, self.distance, travel_time)
         
         # 이동 로깅
         self._log_movement(self.current_location, destination, self.distance, travel_time)
@@ -191,6 +203,15 @@ class AGV(EoModel):
         self.schedule(ev, travel_time)
     
     def _calculate_distance(self, source, destination):
+        """두 머신 간의 거리 조회 (머신 쌍마다 한 번만 계산해서 캐시)"""
+        key = (source, destination)
+        distance = AGV._DIST.get(key)
+        if distance is None:
+            distance = AGV._DIST[key] = AGV._machine_distance(source, destination)
+        return distance
+
+    @staticmethod
+    def _machine_distance(source, destination):
         """두 머신 간의 거리 계산 (간단한 구현)"""
         # 실제 구현에서는 머신 좌표를 사용하여 정확한 거리 계산
         # 현재는 머신 이름을 기반으로 한 간단한 거리 계산
@@ -226,7 +247,7 @@ class AGV(EoModel):
         source_machine = self.current_task['source_machine']
         job = self.current_task['job']
         
-        print(f"[{self.name}] {source_machine}에서 Job {job.id} fetch 중...")
+        logger.debug("[%s] %s에서 Job %s fetch 중...", self.name, source_machine, job.id)
         
         # fetch 완료 이벤트 스케줄링 (간단한 로딩 시간)
         ev = Event('agv_fetch_complete', {
@@ -247,7 +268,7 @@ class AGV(EoModel):
         destination_machine = self.current_task['destination_machine']
         job = self.current_task['job']
         
-        print(f"[{self.name}] {destination_machine}에서 Job {job.id} unload 중...")
+        logger.debug("[%s] %s에서 Job %s unload 중...", self.name, destination_machine, job.id)
         
         # unload 완료 이벤트 스케줄링 (간단한 하역 시간)
         ev = Event('agv_delivery_complete', {
@@ -263,18 +284,18 @@ class AGV(EoModel):
         source_machine = payload['source_machine']
         
         # 작업을 AGV에 적재
-        self.carried_jobs.append(job)
+        self.carried_jobs.add(job)
         old_status = self.status
         self.status = AGVStatus.LOADING
         
         # 상태 변화 로깅
         self._log_status_change(old_status, self.status)
         
-        print(f"[{self.name}] Job {job.id} 적재 완료")
+        logger.debug("[%s] Job %s 적재 완료", self.name, job.id)
         
         # 작업 로깅
         if self.task_start_time is not None:
-            self._log_task('fetch', source_machine, None, job.id, self.task_start_time, EoModel.get_time())
+            self._log_task('fetch', source_machine, None, job.id, self.task_start_time, self.sim.current_time)
         
         # 적재 완료 후 delivery 요청
         self._request_delivery(job)
@@ -283,11 +304,10 @@ class AGV(EoModel):
         """배송 요청"""
         # 현재 작업의 다음 operation이 할당된 기계 찾기
         current_op = job.current_op()
-        if current_op and current_op.candidates:
-            # 첫 번째 후보 기계로 배송 (실제로는 최적화 알고리즘이 결정)
-            destination = current_op.candidates[0]
-            
-            print(f"[{self.name}] Job {job.id}를 {destination}로 배송 요청")
+        # 첫 번째 후보 기계로 배송 (실제로는 최적화 알고리즘이 결정)
+        destination = current_op.first_candidate if current_op else None
+        if destination is not None:
+            logger.debug("[%s] Job %s를 %s로 배송 요청", self.name, job.id, destination)
             
             # AGV 컨트롤러에 배송 요청
             ev = Event('agv_delivery_request', {
@@ -297,7 +317,7 @@ class AGV(EoModel):
             }, dest_model='AGVController')
             self.schedule(ev, 0)
         else:
-            print(f"[{self.name}] Job {job.id}의 다음 작업이 없습니다.")
+            logger.debug("[%s] Job %s의 다음 작업이 없습니다.", self.name, job.id)
             self._return_to_idle()
     
     def _handle_delivery_complete(self, payload):
@@ -306,14 +326,13 @@ class AGV(EoModel):
         destination_machine = payload['destination_machine']
         
         # 작업을 AGV에서 제거
-        if job in self.carried_jobs:
-            self.carried_jobs.remove(job)
+        self.carried_jobs.discard(job)
         
-        print(f"[{self.name}] Job {job.id}를 {destination_machine}에 배송 완료")
+        logger.debug("[%s] Job %s를 %s에 배송 완료", self.name, job.id, destination_machine)
         
         # 작업 로깅
         if self.task_start_time is not None:
-            self._log_task('delivery', None, destination_machine, job.id, self.task_start_time, EoModel.get_time())
+            self._log_task('delivery', None, destination_machine, job.id, self.task_start_time, self.sim.current_time)
         
         # 작업을 목적지 기계에 전달
         ev = Event('part_arrival', {
@@ -328,7 +347,7 @@ class AGV(EoModel):
     def _handle_move_complete(self, payload):
         """이동 완료 처리"""
         destination = payload['destination']
-        print(f"[{self.name}] {destination} 도착 완료")
+        logger.debug("[%s] %s 도착 완료", self.name, destination)
         self._arrive_at_destination()
     
     def _return_to_idle(self):
@@ -341,7 +360,7 @@ class AGV(EoModel):
         
         self.current_task = None
         self.task_start_time = None
-        print(f"[{self.name}] 유휴 상태로 전환")
+        logger.debug("[%s] 유휴 상태로 전환", self.name)
         
         # AGV 컨트롤러에 유휴 상태 알림
         ev = Event('agv_idle', {
@@ -3,16 +3,90 @@ from simulator.dispatch.dispatch import FIFO
 from simulator.result.recorder import Recorder
 from simulator.domain.domain import JobStatus
 from collections import deque
+import csv
+import heapq
+import itertools
+import logging
+import os
 import random
-from enum import Enum, auto
+import sys
+from enum import IntEnum
 
-class OperationStatus(Enum):
-    QUEUED = auto()
-    RUNNING = auto()
-    TRANSFER = auto()
-    DONE = auto()
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 random 모듈로 한 건씩 샘플링
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# 전송 시간 분포 코드 (설정 로드 시 분포 문자열을 한 번만 코드로 변환)
+DIST_NORMAL, DIST_UNIFORM, DIST_EXPONENTIAL = 1, 2, 3
+_DIST_CODES = {'normal': DIST_NORMAL, 'uniform': DIST_UNIFORM, 'exponential': DIST_EXPONENTIAL}
+
+def encode_transfer_spec(spec):
+    """전송 시간 분포 dict를 (code, mean, std, low, high, rate) 튜플로 변환 (정의되지 않은 분포면 None)"""
+    code = _DIST_CODES.get(spec.get('distribution'))
+    if code is None:
+        return None
+    return (code, spec.get('mean', 0.0), spec.get('std', 0.0),
+            spec.get('low', 0), spec.get('high', 0), spec.get('rate', 1.0))
+
+def _delay_sampler(code, mean, std, low, high, rate):
+    """인코딩된 분포를 인자 없는 샘플러로 변환 (분포 종류 분기는 생성 시 한 번만)"""
+    if code == DIST_NORMAL:
+        return lambda: max(0, random.gauss(mean, std))
+    if code == DIST_UNIFORM:
+        return lambda: random.uniform(low, high)
+    return lambda: random.expovariate(rate)
+
+def _undefined_delay():
+    """분포가 정의되지 않은 목적지용 샘플러"""
+    return None
+
+# NumPy로 한 번에 미리 뽑아 두는 전송 시간 개수 (목적지별)
+DELAY_BATCH_SIZE = 1024
+
+class DelayBuffer:
+    """한 목적지의 전송 시간을 NumPy로 배치 샘플링해 두고 하나씩 꺼내 쓰는 버퍼"""
+    __slots__ = ('rng', 'spec', 'values', 'idx')
+
+    def __init__(self, rng, spec):
+        self.rng = rng
+        self.spec = spec  # encode_transfer_spec() 결과
+        self.values = ()  # 리필 때마다 새 리스트로 교체 (제자리 수정 없음)
+        self.idx = 0
+
+    def _refill(self):
+        code, mean, std, low, high, rate = self.spec
+        if code == DIST_NORMAL:
+            batch = np.maximum(0.0, self.rng.normal(mean, std, DELAY_BATCH_SIZE))
+        elif code == DIST_UNIFORM:
+            batch = self.rng.uniform(low, high, DELAY_BATCH_SIZE)
+        else:
+            batch = self.rng.exponential(1.0 / rate, DELAY_BATCH_SIZE)
+        self.values = batch.tolist()
+        self.idx = 0
+
+    def next(self):
+        if self.idx >= len(self.values):
+            self._refill()
+        value = self.values[self.idx]
+        self.idx += 1
+        return value
+
+class OperationStatus(IntEnum):  # 비교는 정수 비교, 값은 상태별 배열 인덱스로도 사용 가능
+    QUEUED = 0
+    RUNNING = 1
+    TRANSFER = 2
+    DONE = 3
+
+OPERATION_STATUS_NAMES = tuple(s.name for s in OperationStatus)
+
+AGV_LOG_COLUMNS = ('timestamp', 'machine', 'activity_type', 'job_id', 'destination', 'duration')
 
 class OperationInfo:
+    __slots__ = ('operation_id', 'status', 'location', 'input_timestamp', 'output_timestamp')
+
     def __init__(self, operation_id, status, location, input_timestamp=None, output_timestamp=None):
         self.operation_id = operation_id
         self.status = status  # OperationStatus Enum
@@ -23,146 +97,340 @@ class OperationInfo:
     def to_dict(self):
         return {
             'operation_id': self.operation_id,
-            'status': self.status.name,  # Enum의 이름으로 저장
+            'status': OPERATION_STATUS_NAMES[self.status],  # Enum의 이름으로 저장
             'location': self.location,
             'input_timestamp': self.input_timestamp,
             'output_timestamp': self.output_timestamp
         }
 
 class Machine(EoModel):
-    def __init__(self, name, transfer_map, initial, dispatch_rule='fifo', simulator=None):
+    __slots__ = ('status', 'queue', '_live', '_dead', '_dead_count', '_op_ids', '_future', '_future_seq', '_idle_checks', 'running',
+                 'transfer', 'transfer_codes', '_rng', '_delay_buffers', '_delay_fns', 'dispatch', 'next_available_time', 'queued_jobs',
+                 'running_jobs', 'finished_jobs', 'transfer_counts', 'max_transfers', 'agv_logs',
+                 '_handlers')
+
+    def __init__(self, name, transfer_map, initial, dispatch_rule='fifo'):
         super().__init__(name)
-        self.status = initial['status']
-        self.queue = deque()
+        # JSON에서 읽은 상태 문자열을 intern해서 'idle'/'busy' 리터럴과 비교가 동일 객체 비교로 끝나게 함
+        self.status = sys.intern(initial['status'])
+        self.queue = deque()  # 릴리스된(바로 처리 가능한) 파트
+        # deque.remove 대신 묘비(tombstone)로 지우고 꺼낼 때 건너뜀
+        self._live = {}  # part -> queue 안의 살아 있는 항목 수
+        self._dead = {}  # part -> 앞쪽부터 건너뛸 항목 수
+        self._dead_count = 0
+        self._op_ids = {}  # part -> 큐 진입 시점의 operation ID (queue_ops 기록용)
+        self._future = []  # 아직 릴리스되지 않은 파트 힙: (release_time, seq, part)
+        self._future_seq = itertools.count()
+        self._idle_checks = set()  # idle_check가 예약되어 있는 릴리스 시각 (같은 시각은 한 번만 예약)
         self.running = None
         self.transfer = transfer_map
+        # 목적지별 인코딩된 전송 시간 분포 (None이면 분포 미정의)
+        self.transfer_codes = {dest: encode_transfer_spec(spec) for dest, spec in transfer_map.items()}
+        # NumPy가 있으면 목적지별 배치 샘플링 버퍼 사용
+        # (RNG는 첫 전송 때 전역 random에서 시드를 받아 생성 → random.seed/스냅샷과 함께 재현됨)
+        self._rng = None
+        self._delay_buffers = {}
+        # 목적지별 인자 없는 샘플러 (첫 전송 때 만들어 두고 이후엔 호출 한 번)
+        self._delay_fns = {}
         self.dispatch = FIFO() if dispatch_rule=='fifo' else FIFO()
         self.next_available_time = 0.0  # 다음 사용 가능 시간
-        self.simulator = simulator  # 시뮬레이터 참조
         
         # Job 상태 관리를 위한 큐들 (OperationInfo 대신 Job 상태 직접 관리)
-        self.queued_jobs = deque()  # 대기 중인 Job들
-        self.running_jobs = deque()  # 실행 중인 Job들
-        self.finished_jobs = []  # 완료된 Job들
+        # dict를 순서 있는 집합(job -> None)으로 사용해 포함 여부/제거를 O(1)로 처리
+        self.queued_jobs = {}  # 대기 중인 Job들
+        self.running_jobs = {}  # 실행 중인 Job들
+        self.finished_jobs = {}  # 완료된 Job들 (값: 완료 시점의 to_dict() 결과, 없으면 None)
         
         # 무한 루프 방지를 위한 전송 횟수 추적
         self.transfer_counts = {}  # {job_id: transfer_count}
         self.max_transfers = 1  # 최대 전송 횟수 (1번 전송 후 현재 기계에서 실행)
         
-        # 간단한 AGV 로깅 시스템
-        self.agv_logs = []  # AGV 활동 로그
+        # 간단한 AGV 로깅 시스템 (Recorder처럼 컬럼별 리스트에 기록, 순서는 AGV_LOG_COLUMNS에서 machine 제외)
+        self.agv_logs = ([], [], [], [], [])
+        
+        # 이벤트 타입별 핸들러 (if/elif 비교 대신 dict 조회로 분기)
+        self._handlers = {
+            'material_arrival': self._on_part_arrival,
+            'part_arrival': self._on_part_arrival,
+            'machine_idle_check': self._on_idle_check,
+            'end_operation': self._on_operation_end,
+            'operation_complete': self._on_operation_end,
+            'agv_delivery_complete': self._on_agv_delivery_complete,
+        }
         
+    def _sample_transfer_time(self, dest):
+        """dest까지의 전송 시간 샘플링 (분포가 정의되지 않았으면 None)"""
+        fn = self._delay_fns.get(dest)
+        if fn is None:
+            fn = self._delay_fns[dest] = self._make_delay_fn(dest)
+        return fn()
+
+    def _make_delay_fn(self, dest):
+        """dest의 분포를 미리 풀어 둔 샘플러 생성"""
+        transfer_code = self.transfer_codes.get(dest)
+        if not transfer_code:
+            return _undefined_delay
+        if np is None:
+            return _delay_sampler(*transfer_code)
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        buf = self._delay_buffers[dest] = DelayBuffer(self._rng, transfer_code)
+        return buf.next
+
+    def save_sampler_state(self):
+        """스냅샷용 샘플러 상태 (NumPy RNG 상태 + 버퍼 위치, RNG 생성 전이면 None)"""
+        if self._rng is None:
+            return None
+        return (self._rng.bit_generator.state,
+                {dest: (buf.values, buf.idx) for dest, buf in self._delay_buffers.items()})
+
+    def restore_sampler_state(self, state):
+        self._delay_fns = {}
+        if state is None:
+            self._rng = None
+            self._delay_buffers = {}
+            return
+        rng_state, buffers = state
+        if self._rng is None:
+            self._rng = np.random.default_rng()
+        self._rng.bit_generator.state = rng_state
+        self._delay_buffers = {}
+        for dest, (values, idx) in buffers.items():
+            buf = self._delay_buffers[dest] = DelayBuffer(self._rng, self.transfer_codes[dest])
+            buf.values, buf.idx = values, idx
+            self._delay_fns[dest] = buf.next
+
+    def save_queue_state(self):
+        """스냅샷용 대기열 상태 (파트 객체는 참조만 저장, Job 상태는 시뮬레이터가 따로 복원)"""
+        # count는 다음 값을 꺼내야만 알 수 있으므로 꺼낸 값으로 다시 만들어 둠
+        seq = next(self._future_seq)
+        self._future_seq = itertools.count(seq)
+        return (tuple(self.queue), dict(self._live), dict(self._dead), self._dead_count,
+                dict(self._op_ids), list(self._future), seq, self.running)
+
+    def restore_queue_state(self, state):
+        queue, live, dead, dead_count, op_ids, future, seq, running = state
+        # 스냅샷은 여러 번 복원되므로 복사본 사용
+        self.queue = deque(queue)
+        self._live = dict(live)
+        self._dead = dict(dead)
+        self._dead_count = dead_count
+        self._op_ids = dict(op_ids)
+        self._future = list(future)
+        self._future_seq = itertools.count(seq)
+        self.running = running
+
+    def restore_idle_checks(self, release_times):
+        """복원된 이벤트 큐에 남아 있는 idle_check의 릴리스 시각으로 예약 표시를 다시 맞춤"""
+        self._idle_checks = set(release_times)
+
     def log_agv_activity(self, activity_type, job_id, destination=None, duration=0.0):
         """AGV 활동 로깅"""
-        log_entry = {
-            'timestamp': EoModel.get_time(),
-            'machine': self.name,
-            'activity_type': activity_type,  # 'delivery_start', 'delivery_complete', 'return'
-            'job_id': job_id,
-            'destination': destination,
-            'duration': duration
-        }
-        self.agv_logs.append(log_entry)
-        print(f"[AGV {self.name}] {activity_type}: Job {job_id} → {destination} (시간: {duration:.2f}초)")
-        
-    def save_agv_logs(self, output_dir='results'):
-        """AGV 로그를 엑셀 파일로 저장"""
-        if not self.agv_logs:
+        # activity_type: 'delivery_start', 'delivery_complete', 'return_home'
+        times, activity_types, job_ids, destinations, durations = self.agv_logs
+        times.append(self.sim.current_time)
+        activity_types.append(activity_type)
+        job_ids.append(job_id)
+        destinations.append(destination)
+        durations.append(duration)
+        logger.debug("[AGV %s] %s: Job %s → %s (시간: %.2f초)", self.name, activity_type, job_id, destination, duration)
+        
+    def save_agv_logs(self, output_dir='results', with_xlsx=False):
+        """AGV 로그를 CSV로 저장 (with_xlsx=True면 엑셀 파일도 저장), 저장한 CSV 경로 반환"""
+        times, activity_types, job_ids, destinations, durations = self.agv_logs
+        if not times:
             return None
-            
-        import pandas as pd
-        import os
         
         os.makedirs(output_dir, exist_ok=True)
         
-        df = pd.DataFrame(self.agv_logs)
-        filename = f'agv_logs_{self.name}.xlsx'
-        filepath = os.path.join(output_dir, filename)
-        
-        df.to_excel(filepath, index=False)
-        print(f"[AGV 로그] {filepath} 저장 완료 ({len(self.agv_logs)}개 로그)")
+        # machine 컬럼은 모든 행이 같으므로 저장할 때 채움
+        columns = (times, [self.name] * len(times), activity_types, job_ids, destinations, durations)
+        filepath = os.path.join(output_dir, f'agv_logs_{self.name}.csv')
+        # DataFrame을 거치지 않고 컬럼 버퍼에서 행 단위로 바로 기록 (Recorder.save와 같은 방식)
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(AGV_LOG_COLUMNS)
+            writer.writerows(zip(*columns))
+        print(f"[AGV 로그] {filepath} 저장 완료 ({len(times)}개 로그)")
+        
+        if with_xlsx:
+            import pandas as pd  # 엑셀 저장할 때만 필요하므로 지연 import
+            df = pd.DataFrame(dict(zip(AGV_LOG_COLUMNS, columns)))
+            xlsx_path = os.path.join(output_dir, f'agv_logs_{self.name}.xlsx')
+            try:
+                # xlsxwriter가 있으면 행 단위로 바로 써 내려가는 constant_memory 모드 사용
+                df.to_excel(xlsx_path, index=False, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}})
+            except ImportError:
+                df.to_excel(xlsx_path, index=False)
         
         return filepath
 
     def handle_event(self, evt):
-        et = evt.event_type
-        if et in ('material_arrival','part_arrival'):
-            part = evt.payload['part']
-            self._enqueue(part)
+        handler = self._handlers.get(evt.event_type)
+        if handler:
+            # 한 이벤트를 처리하는 동안 시뮬레이션 시간은 변하지 않으므로 한 번만 조회해서 넘김
+            handler(evt, self.sim.current_time)
 
-        elif et == 'machine_idle_check':
-            self._start_if_possible()
+    def _on_part_arrival(self, evt, now):
+        self._enqueue(evt.payload['part'], now)
 
-        elif et in ('end_operation','operation_complete'):
-            op_id = evt.payload.get('operation_id')
-            self._finish(op_id)
-            
-        elif et == 'agv_delivery_complete':
-            # AGV 배송 완료 및 복귀 처리
-            payload = evt.payload
-            self.log_agv_activity('delivery_complete', payload['job_id'], payload['destination'], payload['delivery_time'])
-            self.log_agv_activity('return_home', payload['job_id'], self.name, payload['return_time'])
+    def _on_idle_check(self, evt, now):
+        self._idle_checks.discard(evt.payload.get('release_time'))
+        self._start_if_possible(now)
 
-    def _enqueue(self, part):
-        self.queue.append(part)
-        
-        # current_op()이 None인 경우를 처리
-        queue_ops = []
-        for p in self.queue:
-            current_op = p.job.current_op()
-            if current_op:
-                queue_ops.append(current_op.id)
-            else:
-                queue_ops.append('DONE')
-        
-        current_op = part.job.current_op()
-        op_id = current_op.id if current_op else 'DONE'
-        current_time = EoModel.get_time()
+    def _on_operation_end(self, evt, now):
+        self._finish(evt.payload.get('operation_id'), now)
+
+    def _on_agv_delivery_complete(self, evt, now):
+        # AGV 배송 완료 및 복귀 처리
+        payload = evt.payload
+        self.log_agv_activity('delivery_complete', payload['job_id'], payload['destination'], payload['delivery_time'])
+        self.log_agv_activity('return_home', payload['job_id'], self.name, payload['return_time'])
+
+    def _enqueue(self, part, current_time):
+        job = part.job
+        release_time = job.release_time
+        if release_time <= current_time:
+            self._push_ready(part)
+        else:
+            # 릴리스 전이면 힙에 보관하고 릴리스 시각에 idle_check 예약 (같은 시각에 이미 예약돼 있으면 생략)
+            heapq.heappush(self._future, (release_time, next(self._future_seq), part))
+            if release_time not in self._idle_checks:
+                self._idle_checks.add(release_time)
+                self.schedule(Event('machine_idle_check', {'release_time': release_time}, dest_model=self.name),
+                              release_time - current_time)
         
         # Job 상태 업데이트
-        part.job.set_status(JobStatus.QUEUED)
-        part.job.set_location(self.name)
+        job.set_status(JobStatus.QUEUED)
+        job.set_location(self.name)
         
-        # 대기 중인 Job으로 추가 (중복 방지)
-        if part.job not in self.queued_jobs:
-            self.queued_jobs.append(part.job)
+        # 대기 중인 Job으로 추가 (이미 있으면 순서 유지)
+        self.queued_jobs[job] = None
         
-        Recorder.log_queue(part, self.name, current_time, op_id, len(self.queue), queue_ops)
+        # 대기 중인 파트의 operation은 바뀌지 않으므로 진입 시점에 한 번만 계산해 둠
+        current_op = job.current_op()
+        op_id = self._op_ids[part] = current_op.id if current_op else 'DONE'
+
+        # 기록이 꺼져 있으면 queue_ops 목록도 만들지 않음
+        if Recorder.enabled:
+            op_ids = self._op_ids
+            queue_ops = [op_ids[p] for p in self._queued_parts()]
+            Recorder.log_queue(part, self.name, current_time, op_id, self._queue_length(), queue_ops)
 
-        ev = Event('machine_idle_check', dest_model=self.name)
-        self.schedule(ev, 0)
+        # 가공 중이면 idle_check는 아무 일도 하지 않으므로 예약 생략 (_finish에서 다시 예약함)
+        if self.status == 'idle':
+            self._schedule_idle_check()
+
+    def _schedule_idle_check(self):
+        """같은 시각의 idle_check 예약 (바로 시작하지 않고 최적화기가 큐를 보고 결정할 시점을 남김)"""
+        self.schedule(Event('machine_idle_check', dest_model=self.name), 0)
+
+    def _queue_length(self):
+        """대기 중인 파트 수 (묘비 제외, 릴리스 예정 파트 포함)"""
+        return len(self.queue) - self._dead_count + len(self._future)
+
+    def _queued_parts(self):
+        """대기 중인 모든 파트 (릴리스된 파트 다음에 릴리스 예정 파트)"""
+        skip = dict(self._dead)
+        for part in self.queue:
+            n = skip.get(part)
+            if n:
+                skip[part] = n - 1
+                continue
+            yield part
+        for _, _, part in sorted(self._future):
+            yield part
 
-    def _start_if_possible(self):
-        if self.status!='idle' or not self.queue:
+    def _push_ready(self, part):
+        self.queue.append(part)
+        self._live[part] = self._live.get(part, 0) + 1
+
+    def _pop_ready(self):
+        """디스패치 규칙으로 처리 가능 큐에서 파트를 꺼냄 (묘비는 건너뜀, 없으면 None)"""
+        while self.queue:
+            part = self.dispatch.select(self.queue)
+            n = self._dead.get(part)
+            if n:
+                if n == 1:
+                    del self._dead[part]
+                else:
+                    self._dead[part] = n - 1
+                self._dead_count -= 1
+                continue
+            n = self._live[part]
+            if n == 1:
+                del self._live[part]
+                self._op_ids.pop(part, None)
+            else:
+                self._live[part] = n - 1
+            return part
+        return None
+
+    def _remove_queued(self, part):
+        """대기 중인 파트 하나를 제거 (처리 가능 큐는 묘비만 남기고, 묘비가 절반을 넘으면 압축)"""
+        n = self._live.get(part)
+        if n:
+            if n == 1:
+                del self._live[part]
+                self._op_ids.pop(part, None)
+            else:
+                self._live[part] = n - 1
+            self._dead[part] = self._dead.get(part, 0) + 1
+            self._dead_count += 1
+            if self._dead_count > len(self.queue) // 2:
+                self._compact_queue()
             return
-        
-        # release_time이 지난 작업만 처리 가능한지 확인
-        current_time = EoModel.get_time()
-        available_parts = []
+        # 릴리스 예정 파트는 드물어서 힙을 다시 구성
+        for i, entry in enumerate(self._future):
+            if entry[2] is part:
+                self._op_ids.pop(part, None)
+                self._future[i] = self._future[-1]
+                self._future.pop()
+                heapq.heapify(self._future)
+                return
+
+    def _compact_queue(self):
+        """묘비를 걸러 내고 처리 가능 큐를 다시 만듦"""
+        dead = self._dead
+        queue = deque()
         for part in self.queue:
-            if current_time >= part.job.release_time:
-                available_parts.append(part)
-        
-        if not available_parts:
-            # 아직 릴리스되지 않은 작업들만 있는 경우 대기
+            n = dead.get(part)
+            if n:
+                if n == 1:
+                    del dead[part]
+                else:
+                    dead[part] = n - 1
+                continue
+            queue.append(part)
+        self.queue = queue
+        self._dead_count = 0
+
+    def _start_if_possible(self, current_time):
+        if self.status!='idle':
             return
+        
+        # release_time이 지난 파트를 대기 힙에서 처리 가능 큐로 이동
+        future = self._future
+        while future and future[0][0] <= current_time:
+            self._push_ready(heapq.heappop(future)[2])
             
         # 동적 스케줄링 사용 여부 확인
         # 정적 스케줄링만 사용하므로 이 부분은 무시됩니다.
-        # 대신 큐에서 작업을 선택하여 실행합니다.
-        part = self.dispatch.select(available_parts)
+        # 대신 큐에서 작업을 꺼내 실행합니다.
+        part = self._pop_ready()
+        if part is None:
+            # 아직 릴리스되지 않은 작업들만 있는 경우 대기
+            return
         
-        op = part.job.current_op()
+        job = part.job
+        op = job.current_op()
         if op is None:
-            print(f"[Machine {self.name}] Job {part.job.id}의 현재 Operation이 없음 - 큐에서 제거")
-            # 완료된 Job을 큐에서 제거
-            if part in self.queue:
-                self.queue.remove(part)
-            if part.job in self.queued_jobs:
-                self.queued_jobs.remove(part.job)
-            # 다음 작업 처리
-            ev = Event('machine_idle_check', dest_model=self.name)
-            self.schedule(ev, 0)
+            logger.debug("[Machine %s] Job %s의 현재 Operation이 없음 - 큐에서 제거", self.name, job.id)
+            # 완료된 Job을 대기 목록에서 제거
+            self.queued_jobs.pop(job, None)
+            # 다음 작업 처리 (남은 대기 작업도 최적화기가 볼 수 있도록 이벤트로)
+            self._schedule_idle_check()
             return
             
         # 정적 스케줄링 모드에서만 assigned 체크
@@ -175,15 +443,16 @@ class Machine(EoModel):
         #     return
             
         dur = op.sample_duration()
+        op.machine = self.name
+        op.set_start_time(current_time)
 
         self.status = 'busy'
         self.running = part
         part.status = 'processing'
-        current_time = EoModel.get_time()
         
         # Job 상태 업데이트
-        part.job.set_status(JobStatus.RUNNING)
-        part.job.set_location(self.name)
+        job.set_status(JobStatus.RUNNING)
+        job.set_location(self.name)
         
         # Control Tower에 Job 상태 업데이트
         # 정적 스케줄링이므로 이 부분은 무시됩니다.
@@ -198,13 +467,13 @@ class Machine(EoModel):
         #     self.control_tower.update_job_status(part.job.id, job_status)
         
         # 대기 중에서 실행 중으로 이동
-        if part.job in self.queued_jobs:
-            self.queued_jobs.remove(part.job)
-        self.running_jobs.append(part.job)
+        self.queued_jobs.pop(job, None)
+        self.running_jobs[job] = None
         
         # 기계 상태 업데이트
         
-        Recorder.log_start(part, self.name, current_time, op.id, len(self.queue))
+        if Recorder.enabled:
+            Recorder.log_start(part, self.name, current_time, op.id, len(self.queue) - self._dead_count)
         
         # 작업 완료 이벤트 스케줄링
         ev = Event('end_operation', {'part': part, 'operation_id': op.id}, dest_model=self.name)
@@ -213,24 +482,13 @@ class Machine(EoModel):
     def _transfer_to_other_machine(self, part, target_machine):
         """다른 기계로 작업 전송"""
         # 현재 큐에서 제거
-        if part in self.queue:
-            self.queue.remove(part)
-        if part.job in self.queued_jobs:
-            self.queued_jobs.remove(part.job)
+        job = part.job
+        self._remove_queued(part)
+        self.queued_jobs.pop(job, None)
         
         # 전송 시간 계산 (분포에서 샘플링)
-        transfer_spec = self.transfer.get(target_machine, {})
-        if transfer_spec:
-            dist = transfer_spec.get('distribution')
-            if dist == 'normal':
-                transfer_time = max(0, random.gauss(transfer_spec['mean'], transfer_spec['std']))
-            elif dist == 'uniform':
-                transfer_time = random.uniform(transfer_spec.get('low', 0), transfer_spec.get('high', 0))
-            elif dist == 'exponential':
-                transfer_time = random.expovariate(transfer_spec['rate'])
-            else:
-                transfer_time = 0.0
-        else:
+        transfer_time = self._sample_transfer_time(target_machine)
+        if transfer_time is None:
             transfer_time = 0.0
         
         # 전송 이벤트 스케줄링
@@ -238,100 +496,80 @@ class Machine(EoModel):
         self.schedule(ev, transfer_time)
         
         # 전송 횟수 로그
-        transfer_count = self.transfer_counts.get(part.job.id, 0)
-        print(f"[전송] {self.name} → {target_machine}: {part.job.id} (전송시간: {transfer_time:.2f}, 전송횟수: {transfer_count})")
+        transfer_count = self.transfer_counts.get(job.id, 0)
+        logger.debug("[전송] %s → %s: %s (전송시간: %.2f, 전송횟수: %s)", self.name, target_machine, job.id, transfer_time, transfer_count)
 
-    def _finish(self, op_id=None):
+    def _complete_job(self, part, current_time):
+        """Job 완료 처리: 상태 갱신, finished_jobs 기록, transducer에 완료 이벤트 전달"""
+        job = part.job
+        job.set_status(JobStatus.DONE)
+        job.set_location(None)
+        self.finished_jobs[job] = job.to_dict()
+        
+        if Recorder.enabled:
+            Recorder.log_done(part, current_time)
+        done_ev = Event('job_completed', {'part': part}, dest_model='transducer')
+        self.schedule(done_ev, 0)
+
+    def _finish(self, op_id, current_time):
         part = self.running
-        current_time = EoModel.get_time()
+        job = part.job
         
         # 🚨 Operation 완료 시간 기록 강화
-        current_op = part.job.current_op()
+        current_op = job.current_op()
         if current_op:
             # 이전 operation의 완료 시간 기록
             current_op.end_time = current_time
-            print(f"[{self.name}] Operation {current_op.id} 완료 시간 기록: {current_time:.3f}")
+            logger.debug("[%s] Operation %s 완료 시간 기록: %.3f", self.name, current_op.id, current_time)
         
         # Job 완료 시간 업데이트
-        part.job.set_completion_time(current_time)
+        job.set_completion_time(current_time)
         
         # 실행 중에서 제거
-        if part.job in self.running_jobs:
-            self.running_jobs.remove(part.job)
-        
-        Recorder.log_end(part, self.name, current_time, op_id)
-
-        part.job.advance()
-        if part.job.done():
-            # Job 완료 (중복 방지)
-            part.job.set_status(JobStatus.DONE)
-            part.job.set_location(None)
-            if part.job not in self.finished_jobs:
-                self.finished_jobs.append(part.job)
-            
+        self.running_jobs.pop(job, None)
+        
+        if Recorder.enabled:
+            Recorder.log_end(part, self.name, current_time, op_id)
+
+        job.advance()
+        if job.done():
             # queue와 queued_jobs에서 제거
-            if part in self.queue:
-                self.queue.remove(part)
-            if part.job in self.queued_jobs:
-                self.queued_jobs.remove(part.job)
-            
-            # Job 완료 처리
-            
-            Recorder.log_done(part, EoModel.get_time())
-            done_ev = Event('job_completed', {'part': part}, dest_model='transducer')
-            self.schedule(done_ev, 0)
+            self._remove_queued(part)
+            self.queued_jobs.pop(job, None)
+            self._complete_job(part, current_time)
         else:
-            # 다음 기계로 전송
-            current_op = part.job.current_op()
-            nxt = current_op.select_machine() if current_op else None
+            # 다음 기계로 전송 (다음 operation은 한 번만 조회)
+            next_op = job.current_op()
+            nxt = next_op.select_machine() if next_op else None
             
             # 시뮬레이션 기반 최적화를 위한 기계 선택
             if nxt is None:
-                candidates = part.job.current_op().candidates
-                if candidates:
-                    # 시뮬레이션 기반 최적화에서는 최적화 알고리즘이 결정해야 함
-                    # 여기서는 기본 휴리스틱으로 첫 번째 후보 선택 (임시)
-                    nxt = candidates[0]
-                    print(f"[시뮬레이션 기반 할당] Job {part.job.id}의 {part.job.current_op().id}를 {nxt}로 할당 (최적화 알고리즘이 결정해야 함)")
+                # 시뮬레이션 기반 최적화에서는 최적화 알고리즘이 결정해야 함
+                # 여기서는 기본 휴리스틱으로 첫 번째 후보 선택 (임시)
+                nxt = next_op.first_candidate
+                if nxt is not None:
+                    logger.debug("[시뮬레이션 기반 할당] Job %s의 %s를 %s로 할당 (최적화 알고리즘이 결정해야 함)", job.id, next_op.id, nxt)
                 else:
-                    print(f"경고: Job {part.job.id}의 Operation {part.job.current_op().id}에 후보 기계가 없습니다.")
-                    # Job을 완료된 것으로 처리 (중복 방지)
-                    part.job.set_status(JobStatus.DONE)
-                    part.job.set_location(None)
-                    if part.job not in self.finished_jobs:
-                        self.finished_jobs.append(part.job)
-                    
-                    # Job 완료 처리
-                    
-                    Recorder.log_done(part, EoModel.get_time())
-                    done_ev = Event('job_completed', {'part': part}, dest_model='transducer')
-                    self.schedule(done_ev, 0)
+                    logger.warning("경고: Job %s의 Operation %s에 후보 기계가 없습니다.", job.id, next_op.id)
+                    # Job을 완료된 것으로 처리
+                    self._complete_job(part, current_time)
                     self.running = None
                     self.status = 'idle'
-                    ev = Event('machine_idle_check', dest_model=self.name)
-                    self.schedule(ev, 0)
+                    self._schedule_idle_check()
                     return
             
-            spec = self.transfer.get(nxt, {})
-            dist = spec.get('distribution')
-            if dist=='normal':
-                delay = max(0, random.gauss(spec['mean'], spec['std']))
-            elif dist=='uniform':
-                delay = random.uniform(spec.get('low',0), spec.get('high',0))
-            elif dist=='exponential':
-                delay = random.expovariate(spec['rate'])
-            else:
+            delay = self._sample_transfer_time(nxt)
+            if delay is None:
                 # 🚨 기본 전송 시간 설정으로 겹치는 문제 방지
                 delay = 1.0  # 최소 1초 전송 시간 보장
-                print(f"[{self.name}] {nxt}로의 전송 시간이 정의되지 않음 - 기본값 {delay}초 사용")
+                logger.debug("[%s] %s로의 전송 시간이 정의되지 않음 - 기본값 %s초 사용", self.name, nxt, delay)
 
             # Job 상태를 TRANSFER로 설정
-            part.job.set_status(JobStatus.TRANSFER)
-            part.job.set_location(f"{self.name}->{nxt}")
+            job.set_status(JobStatus.TRANSFER)
+            job.set_location(f"{self.name}->{nxt}")
             
             # queued_jobs에서 제거 (전송 중이므로)
-            if part.job in self.queued_jobs:
-                self.queued_jobs.remove(part.job)
+            self.queued_jobs.pop(job, None)
             
             # 정적 스케줄링이므로 이 부분은 무시됩니다.
             # if self.control_tower:
@@ -345,9 +583,10 @@ class Machine(EoModel):
             #     self.control_tower.update_job_status(part.job.id, job_status)
 
             # AGV 배송 시작 로깅
-            self.log_agv_activity('delivery_start', part.job.id, nxt, delay)
+            self.log_agv_activity('delivery_start', job.id, nxt, delay)
             
-            Recorder.log_transfer(part, self.name, nxt, EoModel.get_time(), delay)
+            if Recorder.enabled:
+                Recorder.log_transfer(part, self.name, nxt, current_time, delay)
 
             ev = Event('part_arrival', {'part': part}, dest_model=nxt)
             self.schedule(ev, delay)
@@ -357,7 +596,7 @@ class Machine(EoModel):
             
             # AGV 배송 완료 및 복귀 로깅을 위한 이벤트 스케줄링
             agv_return_ev = Event('agv_delivery_complete', {
-                'job_id': part.job.id,
+                'job_id': job.id,
                 'destination': nxt,
                 'delivery_time': delay,
                 'return_time': return_delay
@@ -368,41 +607,42 @@ class Machine(EoModel):
         self.status = 'idle'
         
         # 기계 상태 업데이트
-        
-        ev = Event('machine_idle_check', dest_model=self.name)
-        self.schedule(ev, 0)
+        self._schedule_idle_check()
 
-    def get_queue_status(self):
-        print(f"\n=== {self.name} 큐 상태 ===")
-        print(f"현재 상태: {self.status}")
-        print(f"대기 중인 파트 수: {len(self.queue)}")
+    def get_queue_status(self, out=None):
+        """큐 상태를 출력 (out이 주어지면 해당 버퍼에 기록)"""
+        print(f"\n=== {self.name} 큐 상태 ===", file=out)
+        print(f"현재 상태: {self.status}", file=out)
+        print(f"대기 중인 파트 수: {self._queue_length()}", file=out)
         
-        print(f"\n대기 중인 Job들 (queued_jobs):")
+        print(f"\n대기 중인 Job들 (queued_jobs):", file=out)
         if self.queued_jobs:
             for i, job in enumerate(self.queued_jobs):
-                print(f"  {i+1}. Job {job.id}, Part {job.part_id}, Operation {job.current_op().id if job.current_op() else 'None'}")
-                print(f"      상태: {job.status.name}, 위치: {job.current_location}, 진행률: {job.get_progress():.2f}")
+                op = job.current_op()
+                print(f"  {i+1}. Job {job.id}, Part {job.part_id}, Operation {op.id if op else 'None'}", file=out)
+                print(f"      상태: {job.status.name}, 위치: {job.current_location}, 진행률: {job.get_progress():.2f}", file=out)
         else:
-            print("  비어있음")
+            print("  비어있음", file=out)
             
-        print(f"\n실행 중인 Job들 (running_jobs):")
+        print(f"\n실행 중인 Job들 (running_jobs):", file=out)
         if self.running_jobs:
             for i, job in enumerate(self.running_jobs):
-                print(f"  {i+1}. Job {job.id}, Part {job.part_id}, Operation {job.current_op().id if job.current_op() else 'None'}")
-                print(f"      상태: {job.status.name}, 위치: {job.current_location}, 진행률: {job.get_progress():.2f}")
+                op = job.current_op()
+                print(f"  {i+1}. Job {job.id}, Part {job.part_id}, Operation {op.id if op else 'None'}", file=out)
+                print(f"      상태: {job.status.name}, 위치: {job.current_location}, 진행률: {job.get_progress():.2f}", file=out)
         else:
-            print("  비어있음")
+            print("  비어있음", file=out)
             
-        print(f"\n현재 큐의 operation 목록:")
-        if self.queue:
-            for i, part in enumerate(self.queue):
-                op = part.job.current_op()
+        print(f"\n현재 큐의 operation 목록:", file=out)
+        if self._queue_length():
+            for i, part in enumerate(self._queued_parts()):
                 job = part.job
-                print(f"  {i+1}. Part {part.id}, Operation {op.id if op else 'None'}")
-                print(f"      Job 상태: {job.status.name}, 진행률: {job.get_progress():.2f}")
+                op = job.current_op()
+                print(f"  {i+1}. Part {part.id}, Operation {op.id if op else 'None'}", file=out)
+                print(f"      Job 상태: {job.status.name}, 진행률: {job.get_progress():.2f}", file=out)
         else:
-            print("  비어있음")
-        print("=" * 30)
+            print("  비어있음", file=out)
+        print("=" * 30, file=out)
 
     def clear_queues(self):
         self.queued_jobs.clear()
@@ -415,7 +655,8 @@ class Machine(EoModel):
             'machine_name': self.name,
             'queued_jobs': [job.to_dict() for job in self.queued_jobs],
             'running_jobs': [job.to_dict() for job in self.running_jobs],
-            'finished_jobs': [job.to_dict() for job in self.finished_jobs],
+            # 완료된 Job은 더 바뀌지 않으므로 완료 시점에 만들어 둔 dict를 재사용
+            'finished_jobs': [info or job.to_dict() for job, info in self.finished_jobs.items()],
             'total_jobs': len(self.queued_jobs) + len(self.running_jobs) + len(self.finished_jobs)
         }
         return summary
@@ -1,8 +1,22 @@
 # --- simulator/model/machine_agv.py ---
 from simulator.engine.simulator import EoModel, Event
-from enum import Enum, auto
+from enum import IntEnum, auto
+from functools import lru_cache
+import logging
 
-class MachineAGVStatus(Enum):
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _machine_ordinal(name):
+    """'M3' -> 3 (M으로 시작하지 않으면 0, 번호를 읽을 수 없으면 None). 머신 이름마다 한 번만 파싱"""
+    if not name or name[0] != 'M':
+        return 0
+    try:
+        return int(name[1:])
+    except ValueError:
+        return None
+
+class MachineAGVStatus(IntEnum):  # 상태 비교를 정수 비교로
     IDLE = auto()          # 유휴 상태 (머신에 대기)
     DELIVERING = auto()    # 작업 배송 중
     RETURNING = auto()     # 배송 완료 후 돌아오는 중
@@ -78,10 +92,10 @@ class MachineAGV(EoModel):
     def deliver_job(self, job, destination_machine):
         """작업을 목적지 머신으로 배송"""
         if self.status != MachineAGVStatus.IDLE:
-            print(f"[{self.name}] 현재 {self.status.name} 상태로 인해 배송 요청을 거부합니다.")
+            logger.debug("[%s] 현재 %s 상태로 인해 배송 요청을 거부합니다.", self.name, self.status.name)
             return
             
-        print(f"[{self.name}] {destination_machine}로 Job {job.id} 배송 시작")
+        logger.debug("[%s] %s로 Job %s 배송 시작", self.name, destination_machine, job.id)
         
         # 로깅
         self._log_event('delivery_request', {
@@ -96,17 +110,18 @@ class MachineAGV(EoModel):
             'source': self.machine_name
         }
         
-        # 작업 시작 시간 기록
-        self.task_start_time = EoModel.get_time()
+        # 작업 시작 시간 기록 (현재 시각은 한 번만 읽어서 아래로 넘김)
+        current_time = self.sim.current_time
+        self.task_start_time = current_time
         
         # 목적지로 이동
-        self._move_to(destination_machine)
+        self._move_to(destination_machine, current_time)
         
-    def _move_to(self, destination):
+    def _move_to(self, destination, current_time):
         """지정된 목적지로 이동"""
         if self.current_location == destination:
             # 이미 목적지에 있는 경우
-            self._arrive_at_destination()
+            self._arrive_at_destination(current_time)
             return
             
         old_status = self.status
@@ -123,11 +138,10 @@ class MachineAGV(EoModel):
         travel_time = self.distance / self.speed
         
         # 출발 시간과 도착 시간 설정
-        current_time = EoModel.get_time()
         self.departure_time = current_time
         self.arrival_time = current_time + travel_time
         
-        print(f"[{self.name}] {self.current_location} → {destination} 이동 시작 (거리: {self.distance:.2f}m, 시간: {travel_time:.2f}초)")
+        logger.debug("[%s] %s → %s 이동 시작 (거리: %.2fm, 시간: %.2f초)", self.name, self.current_location, destination, self.distance, travel_time)
         
         # 이동 로깅
         self._log_movement(self.current_location, destination, self.distance, travel_time)
@@ -140,22 +154,21 @@ class MachineAGV(EoModel):
         
     def _calculate_distance(self, source, destination):
         """두 머신 간의 거리 계산"""
-        try:
-            source_num = int(source[1:]) if source and source[0] == 'M' else 0
-            dest_num = int(destination[1:]) if destination and destination[0] == 'M' else 0
-            # 머신 간격을 10m로 가정
-            return abs(dest_num - source_num) * 10.0
-        except:
+        source_num = _machine_ordinal(source)
+        dest_num = _machine_ordinal(destination)
+        if source_num is None or dest_num is None:
             return 20.0
+        # 머신 간격을 10m로 가정
+        return abs(dest_num - source_num) * 10.0
             
-    def _arrive_at_destination(self):
+    def _arrive_at_destination(self, current_time):
         """목적지 도착 처리"""
         if self.status == MachineAGVStatus.DELIVERING:
-            self._deliver_job()
+            self._deliver_job(current_time)
         elif self.status == MachineAGVStatus.RETURNING:
             self._return_to_home()
             
-    def _deliver_job(self):
+    def _deliver_job(self, current_time):
         """작업 배송 처리"""
         if not self.delivery_task:
             return
@@ -163,7 +176,7 @@ class MachineAGV(EoModel):
         job = self.delivery_task['job']
         destination = self.delivery_task['destination']
         
-        print(f"[{self.name}] {destination}에 Job {job.id} 배송 완료")
+        logger.debug("[%s] %s에 Job %s 배송 완료", self.name, destination, job.id)
         
         # 작업을 목적지 기계에 전달
         ev = Event('part_arrival', {
@@ -174,16 +187,16 @@ class MachineAGV(EoModel):
         
         # 작업 로깅
         if self.task_start_time is not None:
-            self._log_task('delivery', self.machine_name, destination, job.id, self.task_start_time, EoModel.get_time())
+            self._log_task('delivery', self.machine_name, destination, job.id, self.task_start_time, current_time)
         
         # 작업 정보 정리
         self.carried_job = None
         self.delivery_task = None
         
         # 소속 머신으로 돌아가기
-        self._return_home()
+        self._return_home(current_time)
         
-    def _return_home(self):
+    def _return_home(self, current_time):
         """소속 머신으로 돌아가기"""
         if self.current_location == self.machine_name:
             # 이미 집에 있는 경우
@@ -197,7 +210,7 @@ class MachineAGV(EoModel):
         self._log_status_change(old_status, self.status)
         
         # 집으로 이동
-        self._move_to(self.machine_name)
+        self._move_to(self.machine_name, current_time)
         
     def _return_to_home(self):
         """집에 도착하여 유휴 상태로 전환"""
@@ -210,18 +223,18 @@ class MachineAGV(EoModel):
         # 상태 변화 로깅
         self._log_status_change(old_status, self.status)
         
-        print(f"[{self.name}] {self.machine_name}에 도착하여 유휴 상태로 전환")
+        logger.debug("[%s] %s에 도착하여 유휴 상태로 전환", self.name, self.machine_name)
         
     def handle_event(self, event):
         """이벤트 처리"""
         if event.event_type == 'agv_move_complete':
-            self._handle_move_complete(event.payload)
+            self._handle_move_complete(event.payload, self.sim.current_time)
             
-    def _handle_move_complete(self, payload):
+    def _handle_move_complete(self, payload, current_time):
         """이동 완료 처리"""
         destination = payload['destination']
-        print(f"[{self.name}] {destination} 도착 완료")
-        self._arrive_at_destination()
+        logger.debug("[%s] %s 도착 완료", self.name, destination)
+        self._arrive_at_destination(current_time)
         
     def get_status_info(self):
         """AGV 상태 정보 반환"""
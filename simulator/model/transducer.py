@@ -1,21 +1,34 @@
 from simulator.engine.simulator import EoModel, Event
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Transducer(EoModel):
+    __slots__ = ('completed_jobs', '_handlers')
+
     def __init__(self):
         super().__init__('transducer')
         self.completed_jobs = []
+        # 이벤트 타입별 핸들러 (Machine과 같은 방식)
+        self._handlers = {
+            'job_completed': self._on_job_completed,
+        }
 
     def handle_event(self, evt: Event):
-        if evt.event_type=='job_completed':
-            # Job 완료만 기록하고, 저장은 시뮬레이션 끝에서 한 번만 수행
-            part = evt.payload.get('part')
-            if part:
-                self.completed_jobs.append(part.job.id)
-                print(f"[Transducer] Job {part.job.id} 완료 기록")
+        handler = self._handlers.get(evt.event_type)
+        if handler:
+            handler(evt)
+
+    def _on_job_completed(self, evt):
+        # Job 완료만 기록하고, 저장은 시뮬레이션 끝에서 한 번만 수행
+        part = evt.payload.get('part')
+        if part:
+            self.completed_jobs.append(part.job.id)
+            logger.debug("[Transducer] Job %s 완료 기록", part.job.id)
     
-    def finalize(self):
-        """시뮬레이션 완료 후 최종 저장"""
+    def finalize(self, with_xlsx=False):
+        """시뮬레이션 완료 후 최종 저장 (with_xlsx=True면 trace.xlsx도 저장)"""
         from simulator.result.recorder import Recorder
-        Recorder.save()
+        Recorder.save(with_xlsx=with_xlsx)
         print(f"[Transducer] 총 {len(self.completed_jobs)}개 Job 완료: {self.completed_jobs}")
         print(f"[Transducer] trace 파일 저장 완료")
\ No newline at end of file
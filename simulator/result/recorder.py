@@ -1,83 +1,69 @@
 import os
-import pandas as pd
-from simulator.engine.simulator import EoModel
+import csv
+from array import array
 
 class Recorder:
-    records = []
+    # 컬럼 기반(SoA) 버퍼: 이벤트마다 dict를 만들지 않고 컬럼별 리스트에 바로 append
+    COLUMNS = ('part', 'job', 'operation', 'machine', 'event', 'time', 'queue_length', 'queue_ops', 'delay')
+    columns = ([], [], [], [], [], array('d'), [], [], [])
+    # False면 기록하지 않음 (호출하는 쪽에서 이 값을 보고 인자 계산과 호출을 건너뜀)
+    enabled = True
+
+    @classmethod
+    def _append(cls, part, operation, machine, event, time, queue_length=None, queue_ops=None, delay=None):
+        parts, jobs, ops, machines, events, times, queue_lengths, queue_ops_col, delays = cls.columns
+        parts.append(part.id)
+        jobs.append(part.job.id)
+        ops.append(operation)
+        machines.append(machine)
+        events.append(event)
+        times.append(time)
+        queue_lengths.append(queue_length)
+        queue_ops_col.append(queue_ops)
+        delays.append(delay)
 
     @classmethod
     def log_queue(cls, part, machine, time, operation_id, queue_length, queue_ops):
         """큐 대기 진입 시, 대기 중인 operation ID 목록까지 함께 기록"""
-        cls.records.append({
-            'part': part.id,
-            'job': part.job.id,
-            'operation': operation_id,
-            'machine': machine,
-            'event': 'queued',
-            'time': time,
-            'queue_length': queue_length,
-            'queue_ops': ','.join(queue_ops)
-        })
+        cls._append(part, operation_id, machine, 'queued', time, queue_length, ','.join(queue_ops))
 
     @classmethod
     def log_start(cls, part, machine, time, operation_id, queue_length):
-        cls.records.append({
-            'part': part.id,
-            'job': part.job.id,
-            'operation': operation_id,
-            'machine': machine,
-            'event': 'start',
-            'time': time,
-            'queue_length': queue_length,
-            'queue_ops': None
-        })
+        cls._append(part, operation_id, machine, 'start', time, queue_length)
 
     @classmethod
     def log_end(cls, part, machine, time, operation_id):
-        cls.records.append({
-            'part': part.id,
-            'job': part.job.id,
-            'operation': operation_id,
-            'machine': machine,
-            'event': 'end',
-            'time': time,
-            'queue_length': None,
-            'queue_ops': None
-        })
+        cls._append(part, operation_id, machine, 'end', time)
 
     @classmethod
     def log_transfer(cls, part, src_machine, dest_machine, time, delay):
-        cls.records.append({
-            'part': part.id,
-            'job': part.job.id,
-            'operation': part.job.current_op().id if part.job.current_op() else None,
-            'machine': f"{src_machine}->{dest_machine}",
-            'event': 'transfer',
-            'time': time,
-            'delay': delay,
-            'queue_length': None,
-            'queue_ops': None
-        })
+        current_op = part.job.current_op()
+        cls._append(part, current_op.id if current_op else None, f"{src_machine}->{dest_machine}",
+                    'transfer', time, delay=delay)
 
     @classmethod
     def log_done(cls, part, time):
-        cls.records.append({
-            'part': part.id,
-            'job': part.job.id,
-            'operation': None,
-            'machine': None,
-            'event': 'done',
-            'time': time,
-            'queue_length': None,
-            'queue_ops': None
-        })
+        cls._append(part, None, None, 'done', time)
 
     @classmethod
-    def save(cls):
+    def save(cls, with_xlsx=False):
+        """trace.csv 저장 (with_xlsx=True면 trace.xlsx도 저장)"""
         os.makedirs('results', exist_ok=True)
-        df = pd.DataFrame(cls.records)
-        df.to_csv('results/trace.csv', index=False)
+        # CSV는 DataFrame을 거치지 않고 컬럼 버퍼에서 행 단위로 바로 기록
+        with open('results/trace.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(cls.COLUMNS)
+            writer.writerows(zip(*cls.columns))
+        if not with_xlsx:
+            return
+        import pandas as pd
+        df = pd.DataFrame(dict(zip(cls.COLUMNS, cls.columns)))
         try:
-            df.to_excel('results/trace.xlsx', index=False)
+            # xlsxwriter가 있으면 행 단위로 바로 써 내려가는 constant_memory 모드 사용
+            df.to_excel('results/trace.xlsx', index=False, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}})
         except ImportError:
-            pass
+            try:
+                df.to_excel('results/trace.xlsx', index=False)
+            except ImportError:
+                pass
@@ -2,28 +2,113 @@
 """
 Branch and Bound 알고리즘 탐색 과정 시각화
 """
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
+# matplotlib은 실제로 그릴 때만 필요하므로 각 함수 안에서 import (모듈 import 비용 절감)
 import numpy as np
 import json
 import os
 
+# 노드 상태별 (박스 색, 테두리 색) / 엣지 상태별 (선 색, 선 굵기)
+STATUS_NODE_STYLE = {
+    'optimal': ('lightgreen', 'green'),
+    'pruned': ('lightcoral', 'red'),
+    'root': ('lightblue', 'blue'),
+}
+DEFAULT_NODE_STYLE = ('lightgray', 'gray')
+STATUS_EDGE_STYLE = {
+    'optimal': ('green', 3),
+    'pruned': ('red', 1),
+}
+DEFAULT_EDGE_STYLE = ('gray', 1)
+
+# 시각화에 쓰는 최상위 키 (search_log 등 나머지는 읽지 않음)
+SUMMARY_KEYS = ('algorithm', 'best_objective', 'search_time', 'nodes_explored', 'best_schedule')
+
+# (경로, 수정 시각) -> 파싱된 결과 (같은 파일을 다시 시각화할 때 재파싱하지 않음)
+_JSON_CACHE = {}
+
+def _load_json(path):
+    key = (path, os.path.getmtime(path))
+    data = _JSON_CACHE.get(key)
+    if data is None:
+        data = _JSON_CACHE[key] = _parse_summary(path)
+    return data
+
+def _parse_summary(path):
+    """결과 JSON에서 SUMMARY_KEYS만 추출 (ijson이 있으면 스트리밍으로 나머지 값은 만들지 않음)"""
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+    
+    if ijson is not None:
+        builders = {}
+        try:
+            with open(path, 'rb') as f:
+                for prefix, event, value in ijson.parse(f, use_float=True):
+                    top = prefix.partition('.')[0]
+                    if top in SUMMARY_KEYS:
+                        if top not in builders:
+                            builders[top] = ijson.ObjectBuilder()
+                        builders[top].event(event, value)
+            return {k: builder.value for k, builder in builders.items()}
+        except ijson.JSONError:
+            # json.dump가 쓴 Infinity/NaN은 ijson이 읽지 못하므로 표준 파서로 다시 읽음
+            pass
+    
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {k: data[k] for k in SUMMARY_KEYS if k in data}
+
+def _new_figure(figsize, interactive=False, fig=None):
+    """PNG 저장만 할 때는 pyplot/GUI 백엔드를 거치지 않고 Agg 캔버스에 바로 그림
+    
+    fig가 주어지면 새로 만들지 않고 비운 뒤 크기만 바꿔 재사용
+    """
+    if fig is not None:
+        fig.clf()
+        fig.set_size_inches(figsize)
+    elif interactive:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize)
+    else:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+    return fig
+
 class SearchTreeVisualizer:
-    def __init__(self):
-        self.fig, self.ax = plt.subplots(figsize=(16, 12))
-        self.node_positions = {}
+    # 노드가 이보다 많으면 시작 노드와 최적해 노드에만 텍스트를 붙임
+    LABEL_NODE_LIMIT = 200
+
+    def __init__(self, interactive=False, fig=None):
+        self.interactive = interactive  # True면 저장 후 창으로도 표시
+        # Figure는 그릴 데이터가 확인된 뒤에 만듦 (fig가 주어지면 그것을 재사용)
+        self.fig = fig
+        self.ax = None
+        # 노드 ID로 인덱싱하는 좌표 배열 (위치가 없으면 nan)
+        self._pos_x = np.empty(0)
+        self._pos_y = np.empty(0)
         self.current_y = 0
         self.max_depth = 0
         
-    def visualize_search_tree(self, search_log_file='results/simulator_optimization_result.json'):
-        """검색 트리를 시각화합니다."""
+    def visualize_search_tree(self, search_log_file='results/simulator_optimization_result.json', dpi=100):
+        """검색 트리를 시각화합니다. (미리보기는 dpi=100, 최종 저장본만 300 권장)"""
         if not os.path.exists(search_log_file):
             print(f"검색 로그 파일을 찾을 수 없습니다: {search_log_file}")
             return
             
-        with open(search_log_file, 'r') as f:
-            data = json.load(f)
+        try:
+            data = _load_json(search_log_file)
+        except json.JSONDecodeError as e:
+            print(f"검색 로그 파일을 읽을 수 없습니다: {search_log_file} ({e})")
+            return
+        if not data or (data.get('nodes_explored', 0) == 0 and not data.get('best_schedule')):
+            print("시각화할 탐색 결과가 없습니다.")
+            return
+        
+        self.fig = _new_figure((16, 12), self.interactive, self.fig)
+        self.ax = self.fig.add_subplot(111)
         
         # 검색 과정 분석
         self._analyze_search_process(data)
@@ -34,11 +119,13 @@ class SearchTreeVisualizer:
         # 결과 정보 추가
         self._add_result_info(data)
         
-        plt.title('Branch and Bound 알고리즘 탐색 과정', fontsize=16, fontweight='bold')
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig('results/search_tree_visualization.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self.ax.set_title('Branch and Bound 알고리즘 탐색 과정', fontsize=16, fontweight='bold')
+        self.ax.axis('off')
+        self.fig.tight_layout()
+        self.fig.savefig('results/search_tree_visualization.png', dpi=dpi, bbox_inches='tight')
+        if self.interactive:
+            import matplotlib.pyplot as plt
+            plt.show()
         
     def _analyze_search_process(self, data):
         """검색 과정을 분석합니다."""
@@ -53,6 +140,24 @@ class SearchTreeVisualizer:
         # 노드 구조 생성 (실제 로그에서 추출)
         self.nodes = self._create_sample_nodes()
         
+        # 노드 텍스트는 그리기 전에 한 번만 만들어 둠
+        self._action_texts = [self._format_action(node['action']) for node in self.nodes]
+        # 목적함수 값은 배열로 두고 inf(미평가) 여부를 마스크로 한 번에 처리
+        self._objs = np.fromiter((node['objective'] for node in self.nodes), dtype=np.float64, count=len(self.nodes))
+        unbounded = self._objs == np.inf
+        self._obj_texts = np.where(unbounded, 'obj: ∞',
+                                   np.char.add('obj: ', np.char.mod('%.1f', np.where(unbounded, 0.0, self._objs)))).tolist()
+        
+    @staticmethod
+    def _format_action(action):
+        """노드에 표시할 액션 문자열"""
+        if not action:
+            return 'ROOT'
+        action_text = action.replace('Action(', '').replace(', pos=None)', '')
+        if len(action_text) > 20:
+            action_text = action_text[:17] + '...'
+        return action_text
+        
     def _create_sample_nodes(self):
         """실제 실행 결과를 바탕으로 샘플 노드 구조를 생성합니다."""
         nodes = []
@@ -97,103 +202,117 @@ class SearchTreeVisualizer:
         # 노드 그리기
         self._draw_nodes()
         
+        # 컬렉션은 추가할 때마다 축 범위를 다시 맞추지 않으므로 마지막에 한 번만 갱신
+        self.ax.autoscale_view()
+        
         # 범례 추가
         self._add_legend()
         
     def _calculate_node_positions(self):
-        """노드들의 위치를 계산합니다."""
-        depth_nodes = {}
-        
-        # 깊이별로 노드 그룹화
-        for node in self.nodes:
-            depth = node['depth']
-            if depth not in depth_nodes:
-                depth_nodes[depth] = []
-            depth_nodes[depth].append(node)
-            
-        # 각 깊이에서 노드 위치 계산
-        for depth, nodes_at_depth in depth_nodes.items():
-            x_positions = np.linspace(0, 1, len(nodes_at_depth) + 2)[1:-1]
-            for i, node in enumerate(nodes_at_depth):
-                self.node_positions[node['id']] = (x_positions[i], -depth)
-                
-        self.max_depth = max(depth_nodes.keys()) if depth_nodes else 0
+        """노드들의 위치를 계산합니다 (깊이별 균등 배치를 배열 연산으로)."""
+        count = len(self.nodes)
+        if not count:
+            self._pos_x = self._pos_y = np.empty(0)
+            self.max_depth = 0
+            return
+        ids = np.fromiter((node['id'] for node in self.nodes), dtype=np.intp, count=count)
+        depths = np.fromiter((node['depth'] for node in self.nodes), dtype=np.intp, count=count)
+        
+        # 같은 깊이 안에서의 순번 (노드 순서 유지)
+        _, inverse, counts = np.unique(depths, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        starts = np.cumsum(counts) - counts
+        within = np.empty(count, dtype=np.intp)
+        within[order] = np.arange(count) - np.repeat(starts, counts)
+        
+        # 깊이마다 (0, 1) 구간을 노드 수 + 1 등분한 지점에 배치
+        self._pos_x = np.full(ids.max() + 1, np.nan)
+        self._pos_y = np.full(ids.max() + 1, np.nan)
+        self._pos_x[ids] = (within + 1) / (counts[inverse] + 1)
+        self._pos_y[ids] = -depths
+        self.max_depth = int(depths.max())
+        
+    def _has_position(self, node_id):
+        return node_id is not None and 0 <= node_id < len(self._pos_x) and not np.isnan(self._pos_x[node_id])
         
     def _draw_edges(self):
-        """노드 간 연결선을 그립니다."""
-        for node in self.nodes:
-            if node['parent'] is not None and node['parent'] in self.node_positions:
-                parent_pos = self.node_positions[node['parent']]
-                child_pos = self.node_positions[node['id']]
-                
-                # 엣지 색상 결정
-                if node['status'] == 'optimal':
-                    edge_color = 'green'
-                    linewidth = 3
-                elif node['status'] == 'pruned':
-                    edge_color = 'red'
-                    linewidth = 1
-                else:
-                    edge_color = 'gray'
-                    linewidth = 1
-                    
-                self.ax.plot([parent_pos[0], child_pos[0]], 
-                           [parent_pos[1], child_pos[1]], 
-                           color=edge_color, linewidth=linewidth, alpha=0.7)
+        """노드 간 연결선을 그립니다 (모든 엣지를 LineCollection 하나로)."""
+        from matplotlib.collections import LineCollection
+        
+        count = len(self.nodes)
+        if not count or not len(self._pos_x):
+            return
+        ids = np.fromiter((node['id'] for node in self.nodes), dtype=np.intp, count=count)
+        parents = np.fromiter((-1 if node['parent'] is None else node['parent'] for node in self.nodes),
+                              dtype=np.intp, count=count)
+        
+        # 부모와 자식 모두 위치가 있는 엣지만
+        size = len(self._pos_x)
+        valid = (parents >= 0) & (parents < size)
+        valid[valid] &= ~np.isnan(self._pos_x[parents[valid]]) & ~np.isnan(self._pos_x[ids[valid]])
+        if not valid.any():
+            return
+        parents, ids = parents[valid], ids[valid]
+        
+        # (엣지 수, 2점, xy) 배열을 한 번에 구성
+        segments = np.empty((len(ids), 2, 2))
+        segments[:, 0, 0] = self._pos_x[parents]
+        segments[:, 0, 1] = self._pos_y[parents]
+        segments[:, 1, 0] = self._pos_x[ids]
+        segments[:, 1, 1] = self._pos_y[ids]
+        
+        # 엣지 색상 결정
+        styles = [STATUS_EDGE_STYLE.get(node['status'], DEFAULT_EDGE_STYLE)
+                  for node, keep in zip(self.nodes, valid) if keep]
+        colors, linewidths = zip(*styles)
+        # 텍스트(zorder 3)보다 아래에 그리고, 벡터 포맷으로 저장할 때는 이미지 한 장으로 래스터화
+        # (선 끝은 ax.plot 기본값과 같은 projecting)
+        self.ax.add_collection(LineCollection(segments, colors=colors, linewidths=linewidths, alpha=0.7, capstyle='projecting',
+                                              zorder=2, rasterized=True))
                            
     def _draw_nodes(self):
-        """노드들을 그립니다."""
-        for node in self.nodes:
-            if node['id'] in self.node_positions:
-                pos = self.node_positions[node['id']]
+        """노드들을 그립니다 (박스는 PatchCollection 하나로)."""
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import FancyBboxPatch
+        
+        boxes, facecolors, edgecolors = [], [], []
+        label_all = len(self.nodes) <= self.LABEL_NODE_LIMIT
+        text = self.ax.text
+        for node, action_text, obj_text in zip(self.nodes, self._action_texts, self._obj_texts):
+            if self._has_position(node['id']):
+                pos = (self._pos_x[node['id']], self._pos_y[node['id']])
                 
                 # 노드 색상 결정
-                if node['status'] == 'optimal':
-                    color = 'lightgreen'
-                    edgecolor = 'green'
-                elif node['status'] == 'pruned':
-                    color = 'lightcoral'
-                    edgecolor = 'red'
-                elif node['status'] == 'root':
-                    color = 'lightblue'
-                    edgecolor = 'blue'
-                else:
-                    color = 'lightgray'
-                    edgecolor = 'gray'
+                color, edgecolor = STATUS_NODE_STYLE.get(node['status'], DEFAULT_NODE_STYLE)
                 
                 # 노드 박스 그리기
-                box = FancyBboxPatch((pos[0]-0.08, pos[1]-0.15), 0.16, 0.3,
-                                   boxstyle="round,pad=0.02",
-                                   facecolor=color, edgecolor=edgecolor, linewidth=2)
-                self.ax.add_patch(box)
-                
-                # 노드 텍스트
-                if node['action']:
-                    action_text = node['action'].replace('Action(', '').replace(', pos=None)', '')
-                    if len(action_text) > 20:
-                        action_text = action_text[:17] + '...'
-                else:
-                    action_text = 'ROOT'
-                    
-                # 목적함수 값
-                if node['objective'] == float('inf'):
-                    obj_text = '∞'
-                else:
-                    obj_text = f'{node["objective"]:.1f}'
+                boxes.append(FancyBboxPatch((pos[0]-0.08, pos[1]-0.15), 0.16, 0.3,
+                                            boxstyle="round,pad=0.02"))
+                facecolors.append(color)
+                edgecolors.append(edgecolor)
                 
-                # 텍스트 추가
-                self.ax.text(pos[0], pos[1]-0.05, action_text, 
-                           ha='center', va='center', fontsize=8, fontweight='bold')
-                self.ax.text(pos[0], pos[1]+0.05, f'obj: {obj_text}', 
-                           ha='center', va='center', fontsize=7)
+                # 텍스트 추가 (큰 트리에서는 시작 노드와 최적해만)
+                if label_all or node['status'] in ('root', 'optimal'):
+                    text(pos[0], pos[1]-0.05, action_text,
+                         ha='center', va='center', fontsize=8, fontweight='bold')
+                    text(pos[0], pos[1]+0.05, obj_text,
+                         ha='center', va='center', fontsize=7)
+        
+        if boxes:
+            # 컬렉션 기본 joinstyle은 round라서 add_patch와 같은 모서리가 되도록 miter 지정
+            self.ax.add_collection(PatchCollection(boxes, facecolors=facecolors, edgecolors=edgecolors,
+                                                   linewidths=2, joinstyle='miter', zorder=1, rasterized=True))
                 
     def _add_legend(self):
         """범례를 추가합니다."""
+        from matplotlib.patches import Patch
+        
         legend_elements = [
-            patches.Patch(color='lightblue', label='시작 노드'),
-            patches.Patch(color='lightgray', label='탐색된 노드'),
-            patches.Patch(color='lightgreen', label='최적해'),
-            patches.Patch(color='lightcoral', label='가지치기된 노드')
+            Patch(color='lightblue', label='시작 노드'),
+            Patch(color='lightgray', label='탐색된 노드'),
+            Patch(color='lightgreen', label='최적해'),
+            Patch(color='lightcoral', label='가지치기된 노드')
         ]
         
         self.ax.legend(handles=legend_elements, loc='upper right', 
@@ -213,9 +332,13 @@ class SearchTreeVisualizer:
                     fontsize=10, verticalalignment='top',
                     bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
-def create_algorithm_flow_diagram():
+def create_algorithm_flow_diagram(interactive=False, fig=None, dpi=100):
     """Branch and Bound 알고리즘의 흐름도를 생성합니다."""
-    fig, ax = plt.subplots(figsize=(14, 10))
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import FancyBboxPatch
+    
+    fig = _new_figure((14, 10), interactive, fig)
+    ax = fig.add_subplot(111)
     
     # 박스 스타일 정의
     box_style = "round,pad=0.1"
@@ -233,14 +356,15 @@ def create_algorithm_flow_diagram():
         {'pos': (0.5, 0.0), 'text': '최적해\n업데이트', 'color': 'lightgreen'},
     ]
     
-    # 노드 그리기
+    # 노드 그리기 (박스는 PatchCollection 하나로, 패치별 스타일은 match_original로 유지)
+    boxes = []
     for node in nodes:
-        box = FancyBboxPatch((node['pos'][0]-0.08, node['pos'][1]-0.05), 0.16, 0.1,
-                           boxstyle=box_style, facecolor=node['color'], 
-                           edgecolor='black', linewidth=2)
-        ax.add_patch(box)
+        boxes.append(FancyBboxPatch((node['pos'][0]-0.08, node['pos'][1]-0.05), 0.16, 0.1,
+                                    boxstyle=box_style, facecolor=node['color'], 
+                                    edgecolor='black', linewidth=2))
         ax.text(node['pos'][0], node['pos'][1], node['text'], 
                ha='center', va='center', fontsize=9, fontweight='bold')
+    ax.add_collection(PatchCollection(boxes, match_original=True))
     
     # 화살표 그리기
     arrows = [
@@ -271,9 +395,11 @@ def create_algorithm_flow_diagram():
     ax.set_title('Branch and Bound 알고리즘 흐름도', fontsize=16, fontweight='bold')
     ax.axis('off')
     
-    plt.tight_layout()
-    plt.savefig('results/algorithm_flow_diagram.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('results/algorithm_flow_diagram.png', dpi=dpi, bbox_inches='tight')
+    if interactive:
+        import matplotlib.pyplot as plt
+        plt.show()
 
 def main():
     """메인 함수"""
@@ -281,10 +407,10 @@ def main():
     
     # 검색 트리 시각화
     visualizer = SearchTreeVisualizer()
-    visualizer.visualize_search_tree()
+    visualizer.visualize_search_tree(dpi=300)
     
-    # 알고리즘 흐름도 생성
-    create_algorithm_flow_diagram()
+    # 알고리즘 흐름도 생성 (검색 트리의 Figure를 비워서 재사용)
+    create_algorithm_flow_diagram(fig=visualizer.fig, dpi=300)
     
     print("시각화 완료!")
     print("- results/search_tree_visualization.png: 검색 트리")
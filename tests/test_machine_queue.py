@@ -0,0 +1,75 @@
+# --- tests/test_machine_queue.py ---
+import random
+import unittest
+from collections import Counter
+
+from simulator.builder import ModelBuilder
+from simulator.engine.simulator import Simulator
+from simulator.result.recorder import Recorder
+
+
+def build_scenario(seed=0):
+    """scenarios/my_case를 main.py와 같은 방식으로 구성"""
+    random.seed(seed)
+    machines, gen, tx = ModelBuilder('scenarios/my_case', use_dynamic_scheduling=True).build()
+    sim = Simulator()
+    for m in machines:
+        sim.register(m)
+    sim.register(gen)
+    sim.register(tx)
+    gen.initialize()
+    return sim, machines, gen
+
+
+class MachineQueueTest(unittest.TestCase):
+    def test_each_job_finishes_on_one_machine(self):
+        # 시작한 파트가 큐에 남아 있으면 같은 Operation이 다시 선택되어 Job이 두 기계에서 완료됨
+        sim, machines, gen = build_scenario()
+        sim.run()
+        finished = Counter(job.id for m in machines for job in m.finished_jobs)
+        self.assertEqual(sorted(finished), sorted(gen.jobs))
+        self.assertTrue(all(count == 1 for count in finished.values()), finished)
+
+    def test_queue_is_empty_after_run(self):
+        sim, machines, gen = build_scenario()
+        sim.run()
+        for m in machines:
+            self.assertFalse(m.queue, m.name)
+            self.assertFalse(m.queued_jobs, m.name)
+
+
+def step(sim):
+    evt = sim.pop_event()
+    sim.handlers[evt.dest_model](evt)
+
+
+def trace_from(start):
+    """Recorder에 start 행부터 쌓인 기록"""
+    return list(zip(*(column[start:] for column in Recorder.columns)))
+
+
+class SnapshotRestoreTest(unittest.TestCase):
+    def test_restore_replays_same_trace(self):
+        sim, machines, gen = build_scenario()
+        # 가공 중인 기계 뒤에 대기 파트가 있는 시점까지 진행 (대기열 상태가 복원 대상이 되도록)
+        while sim.event_queue and not any(m.running is not None and (len(m.queue) - m._dead_count or m._future)
+                                          for m in machines):
+            step(sim)
+        self.assertTrue(sim.event_queue)
+
+        state = sim.snapshot()
+        start = len(Recorder.columns[0])
+        sim.run()
+        first = trace_from(start)
+
+        sim.restore(state)
+        start = len(Recorder.columns[0])
+        sim.run()
+        second = trace_from(start)
+
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()